@@ -0,0 +1,711 @@
+"""
+Performance benchmarks for the engine and the AI search.
+
+Run from the chess folder:
+    python benchmark.py            # run every benchmark
+    python benchmark.py movegen    # run a single benchmark
+"""
+import multiprocessing
+import pickle
+import queue
+import random
+import sys
+import time
+
+import chess
+
+import chessAi
+from engine import GameState, Move, _pieceCode
+from engineWorker import EngineWorker
+
+# Fixed set of positions used by every benchmark so numbers stay comparable
+BENCHMARK_POSITIONS = [
+    ("start", chess.STARTING_FEN),
+    ("italian", "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"),
+    ("endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"),
+]
+
+
+def timed(function, *args):
+    """Run function(*args) and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def printRow(name, nodes, elapsed, extra=""):
+    nps = nodes / elapsed if elapsed > 0 else 0
+    print(f"  {name:<10} nodes={nodes:>9}  time={elapsed:7.3f}s  nps={nps:>10.0f}  {extra}")
+
+
+# ============================================================================
+# ======================== MOVE GENERATION PATHS ===========================
+# ============================================================================
+def _legacyBoardArray(gs):
+    """The original get_board_array: 64 piece_at lookups per call"""
+    return [[_pieceCode(gs.board.piece_at(chess.square(file, 7 - rank))) for file in range(8)]
+            for rank in range(8)]
+
+
+def _legacyValidMoves(gs):
+    """The original getValidMoves: one board array rebuild per legal move"""
+    moves = []
+    for chess_move in list(gs.board.legal_moves):
+        start = (7 - chess.square_rank(chess_move.from_square), chess.square_file(chess_move.from_square))
+        end = (7 - chess.square_rank(chess_move.to_square), chess.square_file(chess_move.to_square))
+        move = Move(start, end, _legacyBoardArray(gs))
+        move.castle = gs.board.is_castling(chess_move)
+        move.isEnpassantMove = gs.board.is_en_passant(chess_move)
+        if chess_move.promotion:
+            move.isPawnPromotion = True
+            move.promotion = chess.piece_symbol(chess_move.promotion).upper()
+        moves.append(move)
+    return moves
+
+
+def _walkLegacy(gs, depth):
+    if depth == 0:
+        return 1
+    nodes = 1
+    for move in _legacyValidMoves(gs):
+        gs.makeMove(move)
+        nodes += _walkLegacy(gs, depth - 1)
+        gs.undoMove()
+    return nodes
+
+
+def _walkRaw(gs, depth):
+    if depth == 0:
+        return 1
+    nodes = 1
+    for move in list(gs.board.legal_moves):
+        gs.makeMove(move)
+        nodes += _walkRaw(gs, depth - 1)
+        gs.undoMove()
+    return nodes
+
+
+def benchMoveGeneration(depth=2):
+    """Nodes per second of a full tree walk: converted Move objects vs raw chess.Move"""
+    print(f"Move generation tree walk (depth {depth})")
+    for name, fen in BENCHMARK_POSITIONS:
+        nodes, elapsed = timed(_walkLegacy, GameState(fen), depth)
+        printRow(name, nodes, elapsed, "legacy Move conversion")
+        nodes, elapsed = timed(_walkRaw, GameState(fen), depth)
+        printRow(name, nodes, elapsed, "raw chess.Move")
+
+
+# ============================================================================
+# ============================ ALPHA-BETA SEARCH ===========================
+# ============================================================================
+def benchSearch(depth=4):
+    """Nodes per second of findBestMoveAlphaBeta at a fixed depth"""
+    print(f"Alpha-beta search (depth {depth})")
+    saved_depth = chessAi.DEPTH
+    chessAi.DEPTH = depth
+    try:
+        for name, fen in BENCHMARK_POSITIONS:
+            gs = GameState(fen)
+            chessAi.transpositionTable.clear()
+            best_move, elapsed = timed(chessAi.findBestMoveAlphaBeta, gs, gs.getValidMoves())
+            stats = chessAi.transpositionTable.stats()
+            printRow(name, chessAi.nodesSearched, elapsed,
+                     f"best={best_move}  tt hits={stats['hitRate']:.0%} collisions={stats['collisions']}")
+    finally:
+        chessAi.DEPTH = saved_depth
+
+
+def benchIterativeDeepening(timeLimit=2.0):
+    """Depth reached and move latency of iterative deepening with a time budget"""
+    print(f"Iterative deepening ({timeLimit:.1f}s per move)")
+    for name, fen in BENCHMARK_POSITIONS:
+        gs = GameState(fen)
+        chessAi.transpositionTable.clear()
+        progress = queue.Queue()
+        best_move, elapsed = timed(chessAi.findBestMoveIterativeDeepening, gs, gs.getValidMoves(),
+                                   progress, None, timeLimit)
+        iterations = [event for event in _drain(progress) if event[0] == chessAi.EVENT_ITERATION]
+        printRow(name, chessAi.nodesSearched, elapsed,
+                 f"best={best_move}  completed depth={len(iterations)}")
+
+
+def _drain(message_queue):
+    """All messages currently in a queue"""
+    messages = []
+    while not message_queue.empty():
+        messages.append(message_queue.get())
+    return messages
+
+
+def _fixedDepthSearch(fen, depth, options):
+    """(best move, nodes, seconds) of a fixed-depth search with the given searchOptions"""
+    saved_depth, saved_options = chessAi.DEPTH, dict(chessAi.searchOptions)
+    chessAi.DEPTH = depth
+    chessAi.configureSearch(options)
+    try:
+        gs = GameState(fen)
+        chessAi.transpositionTable.clear()
+        best_move, elapsed = timed(chessAi.findBestMoveAlphaBeta, gs, gs.getValidMoves())
+        return best_move, chessAi.nodesSearched, elapsed
+    finally:
+        chessAi.DEPTH = saved_depth
+        chessAi.searchOptions.update(saved_options)
+
+
+# Setting combinations compared by benchOrdering
+ORDERING_CONFIGS = [
+    ("baseline", {}),
+    ("killers", {"killer_heuristic": True}),
+    ("mvv_lva", {"mvv_lva": True}),
+    ("both", {"killer_heuristic": True, "mvv_lva": True}),
+]
+
+
+def benchOrdering(depth=4):
+    """Node counts of a fixed-depth search for each move ordering option"""
+    print(f"Move ordering node counts (depth {depth})")
+    totals = {}
+    for name, fen in BENCHMARK_POSITIONS:
+        for label, options in ORDERING_CONFIGS:
+            best_move, nodes, elapsed = _fixedDepthSearch(fen, depth, options)
+            totals[label] = totals.get(label, 0) + nodes
+            printRow(name, nodes, elapsed, f"{label:<10} best={best_move}")
+    baseline = totals[ORDERING_CONFIGS[0][0]]
+    for label, nodes in totals.items():
+        print(f"  total {label:<10} {nodes:>9} nodes  ({nodes / baseline:.0%} of baseline)")
+
+
+# Depth and settings compared by benchQuiescence: shallow searches resolving
+# captures at the leaves against the deeper plain search
+QUIESCENCE_CONFIGS = [
+    ("plain", 4, {"killer_heuristic": True, "mvv_lva": True}),
+    ("quiescence", 2, {"killer_heuristic": True, "mvv_lva": True, "quiescence": True}),
+    ("quiescence", 3, {"killer_heuristic": True, "mvv_lva": True, "quiescence": True}),
+]
+
+
+def benchQuiescence():
+    """Nodes, time and chosen move with and without quiescence search at the leaves"""
+    print("Quiescence search")
+    for name, fen in BENCHMARK_POSITIONS:
+        for label, depth, options in QUIESCENCE_CONFIGS:
+            best_move, nodes, elapsed = _fixedDepthSearch(fen, depth, options)
+            printRow(name, nodes, elapsed, f"{label:<10} depth={depth} "
+                     f"qnodes={chessAi.quiescenceNodes:<7} best={best_move}")
+
+
+# Settings compared by benchWindows, the baseline is the plain full-window root
+WINDOW_CONFIGS = [
+    ("full", {"killer_heuristic": True, "mvv_lva": True}),
+    ("pvs", {"killer_heuristic": True, "mvv_lva": True, "pvs": True}),
+]
+
+
+def _iterativeSearch(fen, depth, options):
+    """(best move, nodes, seconds) of iterative deepening to depth with the given searchOptions"""
+    saved_options = dict(chessAi.searchOptions)
+    chessAi.configureSearch(options)
+    try:
+        gs = GameState(fen)
+        chessAi.transpositionTable.clear()
+        best_move, elapsed = timed(chessAi.findBestMoveIterativeDeepening, gs, gs.getValidMoves(),
+                                   None, None, float("inf"), depth)
+        return best_move, chessAi.nodesSearched, elapsed
+    finally:
+        chessAi.searchOptions.update(saved_options)
+
+
+def benchWindows(depth=4):
+    """Node counts of full-window root search against PVS, at fixed depth and iterating to depth"""
+    print(f"Search windows (depth {depth})")
+    totals = {}
+    for name, fen in BENCHMARK_POSITIONS:
+        for mode, search in (("fixed", _fixedDepthSearch), ("iterative", _iterativeSearch)):
+            for label, options in WINDOW_CONFIGS:
+                best_move, nodes, elapsed = search(fen, depth, options)
+                totals[mode, label] = totals.get((mode, label), 0) + nodes
+                printRow(name, nodes, elapsed, f"{mode:<9} {label:<5} best={best_move}")
+    for (mode, label), nodes in totals.items():
+        baseline = totals[mode, WINDOW_CONFIGS[0][0]]
+        print(f"  total {mode:<9} {label:<5} {nodes:>9} nodes  ({nodes / baseline:.0%} of {WINDOW_CONFIGS[0][0]})")
+
+
+# Selectivity settings compared by benchSelectivity on top of the full search
+_FULL_SEARCH = {"killer_heuristic": True, "mvv_lva": True, "quiescence": True, "pvs": True}
+SELECTIVITY_CONFIGS = [
+    ("none", _FULL_SEARCH),
+    ("null_move", dict(_FULL_SEARCH, null_move=True)),
+    ("lmr", dict(_FULL_SEARCH, lmr=True)),
+    ("both", dict(_FULL_SEARCH, null_move=True, lmr=True)),
+]
+
+
+def benchSelectivity(depth=5):
+    """Nodes and time of iterative deepening to depth with null-move pruning and LMR toggled"""
+    print(f"Selectivity (iterative deepening to depth {depth})")
+    totals = {}
+    for name, fen in BENCHMARK_POSITIONS:
+        for label, options in SELECTIVITY_CONFIGS:
+            best_move, nodes, elapsed = _iterativeSearch(fen, depth, options)
+            nodes_time = totals.get(label, (0, 0))
+            totals[label] = (nodes_time[0] + nodes, nodes_time[1] + elapsed)
+            printRow(name, nodes, elapsed, f"{label:<10} best={best_move}")
+    baseline = totals[SELECTIVITY_CONFIGS[0][0]][0]
+    for label, (nodes, elapsed) in totals.items():
+        print(f"  total {label:<10} {nodes:>9} nodes {elapsed:7.2f}s  ({nodes / baseline:.0%} of none)")
+
+
+# Worker counts of the speedup curve in benchParallel, and the search settings
+# (nothing that depends on the window, so the parallel search must find the
+# sequential move: no quiescence delta pruning or node limit, no reductions)
+PARALLEL_WORKER_COUNTS = (1, 2, 4, 8)
+PARALLEL_OPTIONS = {"killer_heuristic": True, "mvv_lva": True, "pvs": True}
+
+
+def benchParallel(depth=4):
+    """Speedup of parallel root search over the sequential search at fixed depth"""
+    print(f"Parallel root search (depth {depth}, {chessAi.PARALLEL_WORKERS} cores)")
+    saved_depth, saved_options = chessAi.DEPTH, dict(chessAi.searchOptions)
+    chessAi.DEPTH = depth
+    chessAi.configureSearch(PARALLEL_OPTIONS)
+    sequential_total = 0
+    parallel_totals = {}
+    try:
+        for name, fen in BENCHMARK_POSITIONS:
+            gs = GameState(fen)
+            chessAi.transpositionTable.clear()
+            sequential_move, elapsed = timed(chessAi.findBestMoveAlphaBeta, gs, gs.getValidMoves())
+            sequential_total += elapsed
+            printRow(name, chessAi.nodesSearched, elapsed, f"sequential  best={sequential_move}")
+            for workers in PARALLEL_WORKER_COUNTS:
+                # Fresh pool per run, forked after clearing so no worker starts with a warm table
+                chessAi.shutdownParallelPool()
+                chessAi.transpositionTable.clear()
+                chessAi._getParallelPool(workers)
+                best_move, elapsed = timed(chessAi.findBestMoveParallel, gs, gs.getValidMoves(),
+                                           None, None, workers)
+                parallel_totals[workers] = parallel_totals.get(workers, 0) + elapsed
+                match = "same" if best_move == sequential_move else "DIFFERENT"
+                printRow(name, chessAi.nodesSearched, elapsed, f"{workers} workers   best={best_move} ({match})")
+    finally:
+        chessAi.shutdownParallelPool()
+        chessAi.DEPTH = saved_depth
+        chessAi.searchOptions.update(saved_options)
+    print(f"  sequential total {sequential_total:7.2f}s")
+    for workers, elapsed in parallel_totals.items():
+        print(f"  {workers} workers  total {elapsed:7.2f}s  speedup {sequential_total / elapsed:.2f}x")
+
+
+def benchLazySMP(depth=5):
+    """Time to depth of Lazy SMP, one main search plus helpers sharing one table"""
+    print(f"Lazy SMP (iterative deepening to depth {depth}, {chessAi.PARALLEL_WORKERS} cores)")
+    saved_options = dict(chessAi.searchOptions)
+    chessAi.configureSearch(SELECTIVITY_CONFIGS[-1][1])
+    totals = {}
+    try:
+        for name, fen in BENCHMARK_POSITIONS:
+            for workers in PARALLEL_WORKER_COUNTS:
+                # New table per run so every run starts cold
+                chessAi.shutdownLazySMP()
+                gs = GameState(fen)
+                best_move, elapsed = timed(chessAi.findBestMoveLazySMP, gs, gs.getValidMoves(), None, None,
+                                           float("inf"), workers, depth)
+                totals[workers] = totals.get(workers, 0) + elapsed
+                printRow(name, chessAi.lazySmpNodes, elapsed, f"{workers} workers  best={best_move}")
+    finally:
+        chessAi.shutdownLazySMP()
+        chessAi.searchOptions.update(saved_options)
+    for workers, elapsed in totals.items():
+        print(f"  {workers} workers  total {elapsed:7.2f}s  speedup {totals[1] / elapsed:.2f}x")
+
+
+# ============================================================================
+# ============================== EVALUATION ================================
+# ============================================================================
+def _legacyScoreBoard(gs):
+    """The original 8x8 scan of scoreBoard (without the terminal checks)"""
+    score = 0
+    board_array = _legacyBoardArray(gs)
+    for row in range(8):
+        for col in range(8):
+            square = board_array[row][col]
+            if square != "--":
+                piece_type = square[1]
+                positional_value = 0
+                if piece_type == "p":
+                    positional_value = (chessAi.whitePawnScores if square[0] == "w" else chessAi.blackPawnScores)[row][col]
+                elif piece_type in chessAi.piecePositionScores:
+                    positional_value = chessAi.piecePositionScores[piece_type][row][col]
+                total_value = chessAi.pieceScore[piece_type] + positional_value * 0.1
+                score += total_value if square[0] == "w" else -total_value
+    return score
+
+
+def benchEvaluation(repeat=2000):
+    """Static evaluations per second: original 8x8 scan vs bitboard evaluator"""
+    print(f"Static evaluation ({repeat} calls per position)")
+    for name, fen in BENCHMARK_POSITIONS:
+        gs = GameState(fen)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            legacy = _legacyScoreBoard(gs)
+        printRow(name, repeat, time.perf_counter() - start, f"8x8 scan  score={legacy:.2f}")
+        start = time.perf_counter()
+        for _ in range(repeat):
+            centipawns = chessAi.evaluateBoard(gs.board)
+        printRow(name, repeat, time.perf_counter() - start, f"bitboards score={centipawns / 100:.2f}")
+        assert round(legacy * 100) == centipawns, "bitboard evaluation differs from scoreBoard"
+
+
+# ============================================================================
+# ============================ MOVE MEMORY USE =============================
+# ============================================================================
+class _LegacyMove():
+    """
+    The original Move layout: a per-instance __dict__, created with the squares
+    and resolved from the board on first access, as fromChessMove did
+    """
+    
+    def __init__(self, move, board):
+        self.chessMove = move.chessMove
+        self.startRow, self.startCol = move.startRow, move.startCol
+        self.endRow, self.endCol = move.endRow, move.endCol
+        self._board = board
+    
+    def __getattr__(self, name):
+        board = self.__dict__.get('_board')
+        if board is None or name.startswith('_'):
+            raise AttributeError(name)
+        self._resolve(board)
+        return object.__getattribute__(self, name)
+    
+    def _resolve(self, board):
+        chess_move = self.chessMove
+        attributes = self.__dict__
+        del attributes['_board']
+        self.pieceMoved = _pieceCode(board.piece_at(chess_move.from_square))
+        self.isEnpassantMove = board.is_en_passant(chess_move)
+        if self.isEnpassantMove:
+            captured_square = chess.square(self.endCol, 7 - self.startRow)
+        else:
+            captured_square = chess_move.to_square
+        self.pieceCaptured = _pieceCode(board.piece_at(captured_square))
+        self.isCapture = self.pieceCaptured != '--'
+        self.castle = board.is_castling(chess_move)
+        self.moveID = self.startRow * 1000 + self.startCol * 100 + self.endRow * 10 + self.endCol
+        self.isPawnPromotion = chess_move.promotion is not None
+        if self.isPawnPromotion and 'promotion' not in attributes:
+            self.promotion = chess.piece_symbol(chess_move.promotion).upper()
+
+
+def _moveSize(move):
+    """Shallow size of a Move including its instance __dict__, if it has one"""
+    size = sys.getsizeof(move)
+    if hasattr(move, '__dict__'):
+        size += sys.getsizeof(move.__dict__)
+    return size
+
+
+def benchMemory(depth=4):
+    """Move object size and count during a search, and pickled size of the root move list"""
+    print(f"Move memory and allocations (search depth {depth})")
+    saved_depth = chessAi.DEPTH
+    chessAi.DEPTH = depth
+    try:
+        for name, fen in BENCHMARK_POSITIONS[:2]:
+            gs = GameState(fen)
+            chessAi.transpositionTable.clear()
+            valid_moves = gs.getValidMoves()
+            for move in valid_moves:
+                move.pieceMoved  # resolve lazy attributes so sizes are comparable
+            move_bytes = _moveSize(valid_moves[0])
+            pickled_bytes = len(pickle.dumps(valid_moves))
+            legacy_moves = [_LegacyMove(move, gs.board) for move in valid_moves]
+            for move in legacy_moves:
+                move.pieceMoved
+            legacy_bytes = _moveSize(legacy_moves[0])
+            legacy_pickled_bytes = len(pickle.dumps(legacy_moves))
+            
+            # Every Move created while the search runs goes through these two constructors
+            created = [0]
+            def counting(constructor):
+                def wrapper(*args, **kwargs):
+                    created[0] += 1
+                    return constructor(*args, **kwargs)
+                return wrapper
+            saved_constructors = Move.__init__, Move.fromChessMove
+            Move.__init__ = counting(Move.__init__)
+            Move.fromChessMove = counting(Move.fromChessMove)
+            try:
+                best_move, elapsed = timed(chessAi.findBestMoveAlphaBeta, gs, valid_moves)
+            finally:
+                Move.__init__ = saved_constructors[0]
+                Move.fromChessMove = saved_constructors[1]
+            
+            printRow(name, chessAi.nodesSearched, elapsed,
+                     f"moves created={created[0]}  move={move_bytes}B  "
+                     f"total={created[0] * move_bytes / 1024:.0f}KiB  pickled root moves={pickled_bytes}B")
+            print(f"  {'':<10} original __dict__ move={legacy_bytes}B  "
+                  f"total={created[0] * legacy_bytes / 1024:.0f}KiB  pickled root moves={legacy_pickled_bytes}B")
+    finally:
+        chessAi.DEPTH = saved_depth
+
+
+# ============================================================================
+# ========================== AI WORKER HANDOFF =============================
+# ============================================================================
+def _playRandomGame(plies, seed=7):
+    """GameState after up to `plies` random legal moves (reproducible)"""
+    rng = random.Random(seed)
+    gs = GameState()
+    while len(gs.moveLog) < plies and not gs.board.is_game_over():
+        gs.makeMove(gs.getValidMoves()[rng.randrange(len(gs.getValidMoves()))])
+    return gs
+
+
+def _roundTrip(payload):
+    """Pickle and unpickle, as multiprocessing does for Process args"""
+    data = pickle.dumps(payload)
+    pickle.loads(data)
+    return len(data)
+
+
+def benchHandoff(lengths=(10, 50, 100, 200), repeat=20):
+    """Cost of handing a position to the AI worker as the game gets longer"""
+    print(f"AI worker handoff ({repeat} round trips)")
+    for plies in lengths:
+        gs = _playRandomGame(plies)
+        label = f"{len(gs.moveLog)} plies"
+        
+        start = time.perf_counter()
+        for _ in range(repeat):
+            size = _roundTrip((gs, gs.getValidMoves()))
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<10} full GameState  {size:>7}B  {elapsed / repeat * 1000:7.3f}ms")
+        
+        start = time.perf_counter()
+        for _ in range(repeat):
+            size = _roundTrip(gs.snapshot())
+            GameState.from_snapshot(gs.snapshot())
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<10} snapshot        {size:>7}B  {elapsed / repeat * 1000:7.3f}ms")
+
+
+def _oneShotSearch(context, snapshot, ai_algorithms, ai_info):
+    """The previous GUI protocol: a new Process and Queues for every move"""
+    result_queue, thinking_queue = context.Queue(), context.Queue()
+    process = context.Process(target=chessAi.findBestMove,
+                              args=(snapshot, result_queue, ai_algorithms, thinking_queue, ai_info))
+    process.start()
+    move = result_queue.get()
+    process.join()
+    return move
+
+
+def _waitAnswer(worker):
+    while True:
+        done, move = worker.poll()
+        if done:
+            return move
+        time.sleep(0.0005)
+
+
+def _workerSearch(worker, snapshot, ai_algorithms, ai_info):
+    worker.newPosition(snapshot)
+    worker.go(ai_algorithms, ai_info)
+    return _waitAnswer(worker)
+
+
+# (label, ai_algorithms, ai_info) of the requests timed by benchWorker
+WORKER_REQUESTS = [
+    ("random", {"random": True}, {"color": "", "mode": "Random"}),
+    ("alpha-beta", dict(SELECTIVITY_CONFIGS[-1][1], alpha_beta=True), {"color": "", "mode": "Alpha-Beta"}),
+]
+# Fixed-depth searches (the GUI default and the parallel root search) under a hard limit in seconds
+CAPPED_REQUESTS = [
+    ("fixed depth", {"alpha_beta": True}),
+    ("parallel", {"alpha_beta": True, "parallel_root": True}),
+]
+CAPPED_HARD_LIMIT = 0.3
+
+
+def benchWorker(plies=12):
+    """Per-move latency of a new Process per move against the persistent EngineWorker"""
+    print(f"AI worker latency over {plies} consecutive positions of one game")
+    game = _playRandomGame(plies)
+    snapshots = []
+    replay = GameState()
+    for move in game.moveLog:
+        replay.makeMove(move)
+        snapshots.append(replay.snapshot())
+    worker = EngineWorker()
+    worker.ready.wait()
+    try:
+        for label, ai_algorithms, ai_info in WORKER_REQUESTS:
+            # fork is the Linux default, spawn the macOS and Windows one
+            for method in ("fork", "spawn"):
+                context = multiprocessing.get_context(method)
+                start = time.perf_counter()
+                for snapshot in snapshots:
+                    _oneShotSearch(context, snapshot, ai_algorithms, ai_info)
+                elapsed = (time.perf_counter() - start) / len(snapshots)
+                print(f"  {label:<11} process per move ({method:<5}) {elapsed * 1000:8.1f}ms per move")
+            start = time.perf_counter()
+            for snapshot in snapshots:
+                _workerSearch(worker, snapshot, ai_algorithms, ai_info)
+            elapsed = (time.perf_counter() - start) / len(snapshots)
+            print(f"  {label:<11} persistent worker        {elapsed * 1000:8.1f}ms per move")
+        
+        # Cooperative stop: time from stop() to the answer of a long search
+        ai_algorithms = dict(SELECTIVITY_CONFIGS[-1][1], alpha_beta=True, iterative_deepening=True, time_limit=60)
+        for name, fen in BENCHMARK_POSITIONS:
+            worker.newPosition(GameState(fen).snapshot())
+            worker.go(ai_algorithms, {"color": "", "mode": "Alpha-Beta"})
+            time.sleep(1.0)
+            start = time.perf_counter()
+            worker.stop()
+            move = _waitAnswer(worker)
+            depth = worker.bestSoFar()[0]
+            print(f"  {name:<11} stopped after 1s, answered in {(time.perf_counter() - start) * 1000:6.1f}ms "
+                  f"with {move} from depth {depth}")
+        
+        # Hard limit on a fixed-depth search: the best of the root moves it finished
+        for label, ai_algorithms in CAPPED_REQUESTS:
+            for name, fen in BENCHMARK_POSITIONS:
+                worker.clear()
+                worker.newPosition(GameState(fen).snapshot())
+                start = time.perf_counter()
+                worker.go(ai_algorithms, {"color": "", "mode": "Alpha-Beta"}, CAPPED_HARD_LIMIT)
+                move = _waitAnswer(worker)
+                print(f"  {name:<11} {label}, depth {chessAi.DEPTH}, capped at {CAPPED_HARD_LIMIT}s: "
+                      f"{move} after {(time.perf_counter() - start) * 1000:6.1f}ms")
+    finally:
+        worker.close()
+
+
+def benchEvents(timeLimit=2.0):
+    """What the GUI receives from a worker search: batches, events, bytes and the longest silence"""
+    print(f"Search progress stream of the engine worker (iterative deepening, {timeLimit:.1f}s)")
+    ai_algorithms = dict(SELECTIVITY_CONFIGS[-1][1], alpha_beta=True, iterative_deepening=True,
+                         time_limit=timeLimit)
+    worker = EngineWorker()
+    worker.ready.wait()
+    try:
+        for name, fen in BENCHMARK_POSITIONS:
+            worker.newPosition(GameState(fen).snapshot())
+            last = time.perf_counter()
+            worker.go(ai_algorithms, {"color": "", "mode": "Alpha-Beta"})
+            batches = events = size = 0
+            longest_gap = 0.0
+            done = False
+            while not done:
+                done = worker.poll()[0]
+                time.sleep(0.005)
+                for batch in _drain(worker.thinking):
+                    now = time.perf_counter()
+                    longest_gap = max(longest_gap, now - last)
+                    last = now
+                    batches += 1
+                    events += len(batch)
+                    size += len(pickle.dumps(batch))
+            print(f"  {name:<11} {batches:>4} batches {events:>5} events {size:>7}B  "
+                  f"longest wait {longest_gap * 1000:6.1f}ms")
+    finally:
+        worker.close()
+
+
+PONDER_REQUESTS = [
+    ("alpha-beta", dict(_FULL_SEARCH, alpha_beta=True)),
+    ("iterative", dict(_FULL_SEARCH, alpha_beta=True, iterative_deepening=True, time_limit=1.0)),
+]
+
+
+def _timedAnswer(worker):
+    start = time.perf_counter()
+    move = _waitAnswer(worker)
+    return move, time.perf_counter() - start
+
+
+def benchPonder(thinkTime=2.0):
+    """AI reply latency after the human moves: no pondering, ponder hit, and ponder miss"""
+    print(f"Pondering, human thinking {thinkTime:.1f}s (reply latency after the human move)")
+    ai_info = {"color": "", "mode": "Alpha-Beta"}
+    worker = EngineWorker()
+    worker.ready.wait()
+    try:
+        for label, ai_algorithms in PONDER_REQUESTS:
+            for name, fen in BENCHMARK_POSITIONS:
+                gs = GameState(fen)
+                
+                def aiMove(ponderMove=None):
+                    """Fresh tables, the AI move from gs, and the position after it"""
+                    worker.clear()
+                    move = _workerSearch(worker, gs.snapshot(), ai_algorithms, ai_info)
+                    after = GameState.from_snapshot(gs.snapshot())
+                    after.makeMove(move)
+                    if ponderMove is not None:
+                        worker.ponder(after.snapshot(), ponderMove, ai_algorithms, ai_info)
+                        time.sleep(thinkTime)
+                    return after
+                
+                after = aiMove()
+                expected = worker.ponderMove
+                if expected is None:
+                    print(f"  {label:<10} {name:<11} no expected reply")
+                    continue
+                other = next(move.uci() for move in after.getValidMoves() if move.uci() != expected)
+                timings = []
+                for reply in (expected, other):
+                    # No pondering: the reply position is searched after the human move
+                    after = aiMove()
+                    worker.newPosition((after.snapshot()[0], f"{after.snapshot()[1]} {reply}".lstrip()))
+                    worker.go(ai_algorithms, ai_info)
+                    timings.append(_timedAnswer(worker)[1])
+                    # Pondering on the expected reply
+                    after = aiMove(expected)
+                    if reply == expected:
+                        worker.ponderHit()
+                    else:
+                        worker.stop()
+                        worker.newPosition((after.snapshot()[0], f"{after.snapshot()[1]} {reply}".lstrip()))
+                        worker.go(ai_algorithms, ai_info)
+                    timings.append(_timedAnswer(worker)[1])
+                print(f"  {label:<10} {name:<11} hit {timings[0] * 1000:7.1f}ms -> {timings[1] * 1000:6.1f}ms"
+                      f"   miss {timings[2] * 1000:7.1f}ms -> {timings[3] * 1000:7.1f}ms")
+    finally:
+        worker.close()
+
+
+BENCHMARKS = {
+    "movegen": benchMoveGeneration,
+    "evaluate": benchEvaluation,
+    "search": benchSearch,
+    "iterative": benchIterativeDeepening,
+    "ordering": benchOrdering,
+    "quiescence": benchQuiescence,
+    "windows": benchWindows,
+    "selectivity": benchSelectivity,
+    "parallel": benchParallel,
+    "lazysmp": benchLazySMP,
+    "memory": benchMemory,
+    "handoff": benchHandoff,
+    "worker": benchWorker,
+    "events": benchEvents,
+    "ponder": benchPonder,
+}
+
+
+def main(argv):
+    names = argv or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}', choose from: {', '.join(BENCHMARKS)}")
+            return 1
+        BENCHMARKS[name]()
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
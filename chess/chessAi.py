@@ -1,4 +1,11 @@
+import math
+import multiprocessing
+import os
+from multiprocessing import shared_memory
 import random
+import time
+import chess
+from engine import GameState, OUTCOME_CHECKMATE
 nextMove = None
 pieceScore = {"K": 0, "Q": 9, "R": 5, "B": 3, "N": 3, "p": 1}
 
@@ -63,15 +70,165 @@ piecePositionScores = {"N": knightScores, "B": bishopScores, "Q": queenScores,
                        "R": rookScores, "wp": whitePawnScores, "bp": blackPawnScores}
 
 
+# ================= BITBOARD EVALUATION TABLES (CENTIPAWNS) ================
+
+def _squareTable(scores, value):
+    """Flatten an 8x8 row/col table to python-chess square order (a1 = 0) in centipawns"""
+    return [value * 100 + scores[7 - chess.square_rank(square)][chess.square_file(square)] * 10
+            for square in chess.SQUARES]
+
+
+# pieceSquareTables[color][piece_type][square]: material plus positional value,
+# indexed like python-chess (color False = black); kings score 0 everywhere
+_kingTable = [0] * 64
+pieceSquareTables = [
+    [None, _squareTable(blackPawnScores, pieceScore["p"]), _squareTable(knightScores, pieceScore["N"]),
+     _squareTable(bishopScores, pieceScore["B"]), _squareTable(rookScores, pieceScore["R"]),
+     _squareTable(queenScores, pieceScore["Q"]), _kingTable],
+    [None, _squareTable(whitePawnScores, pieceScore["p"]), _squareTable(knightScores, pieceScore["N"]),
+     _squareTable(bishopScores, pieceScore["B"]), _squareTable(rookScores, pieceScore["R"]),
+     _squareTable(queenScores, pieceScore["Q"]), _kingTable],
+]
+
+
 # ======================== AI ALGORITHM CONFIGURATION ======================
 
 CHECKMATE = 1000
 STALEMATE = 0
 DEPTH = 4
 
+# Iterative deepening: per-move time budget in seconds and depth cap
+MOVE_TIME_LIMIT = 3.0
+MAX_DEPTH = 64
+# Nodes between two clock checks
+TIME_CHECK_INTERVAL = 1024
+# Quiescence search: most nodes spent resolving captures below one leaf, and
+# margin (pawns) above the captured piece value under which a capture is pruned
+QUIESCENCE_NODE_LIMIT = 2000
+DELTA_MARGIN = 2
+# Principal variation search: width of the null window (scores move in whole
+# centipawns, so half a centipawn separates "at most alpha" from "above alpha")
+NULL_WINDOW = 0.005
+# Aspiration windows (pawns) around the previous iteration's score, widened
+# one step on every fail low/high and then dropped for the full window
+ASPIRATION_WINDOWS = (0.25, 1.0, 3.0)
+# Null-move pruning: depth reduction of the null move search and least depth to try it
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+# Late move reductions: quiet moves after the first LMR_FULL_DEPTH_MOVES are
+# searched LMR_REDUCTION plies shallower from LMR_MIN_DEPTH on
+LMR_FULL_DEPTH_MOVES = 4
+LMR_MIN_DEPTH = 3
+LMR_REDUCTION = 1
+# Parallel root search: default number of worker processes, and seconds between
+# two stop checks while waiting for them
+PARALLEL_WORKERS = os.cpu_count() or 1
+PARALLEL_POLL_INTERVAL = 0.02
+# Seconds between two batches of progress events sent by EventBatcher
+PROGRESS_INTERVAL = 0.1
+
+# Cross-check the incrementally updated evaluation against a full evaluateBoard
+DEBUG_EVALUATION = False
+
 # Search tree tracking for visualization - REMOVED
 current_search_id = 0
 
+# Number of minimax nodes visited by the last search (for benchmarks),
+# of which quiescenceNodes were in quiescence search
+nodesSearched = 0
+quiescenceNodes = 0
+
+# Quiescence nodes left for the leaf being resolved
+quiescenceBudget = 0
+
+# perf_counter() time at which the running search must stop, None for no limit
+searchDeadline = None
+# Node count at which the running search must stop, None for no limit
+searchNodeLimit = None
+# Lazy SMP: shared count of the nodes of the helpers, also counted against searchNodeLimit
+helperNodeCounter = None
+# multiprocessing.Event that stops the running search when set, None for none
+searchStopEvent = None
+# Called as iterationCallback(depth, move, score) whenever a search completes an
+# iteration (fixed-depth searches report their only one), for anytime results
+iterationCallback = None
+# Called as progressCallback() on every clock check of a running search, for live progress
+progressCallback = None
+
+# Optional search features of the running search, set from the AI settings dicts
+searchOptions = {
+    "killer_heuristic": False,
+    "mvv_lva": False,
+    "quiescence": False,
+    "pvs": False,
+    "null_move": False,
+    "lmr": False,
+}
+
+# Length of the move stack at the root of the running search (ply = stack length - this)
+searchRootPly = 0
+
+# Transposition table memory budget in megabytes
+TT_SIZE_MB = 16
+
+
+# ============================================================================
+# ======================= SEARCH PROGRESS EVENTS ===========================
+# ============================================================================
+# Searches report through thinking_queue.put((kind, fields)); the AI Thinking
+# panel makes its text from them. Moves are UCI strings, scores in pawns.
+EVENT_START = "start"            # color, algorithm, moves, ponder, depth or time_limit
+EVENT_ROOT_MOVES = "root_moves"  # depth, scores: [(move, score), ...] in search order
+EVENT_ITERATION = "iteration"    # depth, move, score, pv, nodes, nps, elapsed
+EVENT_RESEARCH = "research"      # depth, score, alpha, beta of a failed aspiration window
+EVENT_TABLE = "table"            # transpositionTable.stats()
+EVENT_PROGRESS = "progress"      # nodes, nps, elapsed of the running search
+EVENT_BEST_MOVE = "bestmove"     # move, score, depth
+EVENT_LAZY_SMP = "lazy_smp"      # workers: processes searching the position together
+
+
+class EventBatcher():
+    """
+    thinking_queue of a search in another process than the GUI: events are
+    collected and sent on as one list at most every interval seconds, with an
+    EVENT_PROGRESS in between while the search runs. Install tick() as
+    progressCallback and call flush() when the search is over.
+    """
+    
+    def __init__(self, queue, interval=PROGRESS_INTERVAL):
+        self.queue = queue
+        self.interval = interval
+        self.events = []
+        self.start = self.lastSent = time.perf_counter()
+    
+    def put(self, event):
+        self.events.append(event)
+    
+    def tick(self):
+        if time.perf_counter() - self.lastSent >= self.interval:
+            self.events.append((EVENT_PROGRESS, progressFields(self.start)))
+            self.flush()
+    
+    def flush(self):
+        if self.events:
+            self.queue.put(self.events)
+            self.events = []
+        self.lastSent = time.perf_counter()
+
+
+def progressFields(startTime):
+    """nodes (with those of Lazy SMP helpers), nps and elapsed seconds of the running search started at startTime"""
+    elapsed = time.perf_counter() - startTime
+    nodes = nodesSearched + (helperNodeCounter.value if helperNodeCounter else 0)
+    return {"nodes": nodes, "nps": nodes / elapsed if elapsed > 0 else 0.0, "elapsed": elapsed}
+
+
+def _startEvent(ai_info, algorithm, validMoves, **fields):
+    """ponder is the opponent move a ponder search assumes (ai_info['ponder']), else None"""
+    return (EVENT_START, dict(color=ai_info['color'] if ai_info else None, algorithm=algorithm,
+                              moves=len(validMoves), ponder=ai_info.get('ponder') if ai_info else None,
+                              **fields))
+
 
 # \\\\\\\\\\\\\\\\\\\\\ AI ALGORITHM IMPLEMENTATIONS \\\\\\\\\\\\\\\\\\\\\\\
 
@@ -85,75 +242,629 @@ def findRandomMoves(validMoves, thinking_queue=None, ai_info=None):
     # If this is a pawn promotion move, choose the promotion piece randomly
     # so AI doesn't always promote to a queen "as it always did before".
     try:
-        if hasattr(selected, 'isPawnPromotion') and selected.isPawnPromotion:
+        if selected.isPawnPromotion:
             # choose from Queen, Rook, Bishop, Knight
             selected.promotion = random.choice(['Q', 'R', 'B', 'N'])
-            if thinking_queue:
-                thinking_queue.put(f"Selected promotion piece -> {selected.promotion}")
     except Exception:
         pass
     
     if thinking_queue:
-        try:
-            moves_str = ", ".join(str(m) for m in validMoves)
-        except Exception:
-            moves_str = str(validMoves)
-        
-        # Add structured thinking messages
-        separator = "-" * 60
-        thinking_queue.put(separator)
-        
-        if ai_info:
-            thinking_queue.put(f"AI {ai_info['color']} [{ai_info['mode']}] is thinking...")
-        else:
-            thinking_queue.put("AI is thinking...")
-            
-        thinking_queue.put(f"Possible moves: [{moves_str}]")
-        thinking_queue.put(f"Selected move of index [{index}] -> {selected}")
-        thinking_queue.put(f"Selected move -> {selected}")
-        thinking_queue.put(separator)
+        thinking_queue.put(_startEvent(ai_info, ai_info['mode'] if ai_info else "Random", validMoves))
+        thinking_queue.put((EVENT_BEST_MOVE, {"move": selected.uci(), "score": None, "depth": 0}))
     
     return selected
 
 
+# ============================================================================
+# ======================== TRANSPOSITION TABLE =============================
+# ============================================================================
+# Bound types of a stored score (scores are from white's point of view)
+TT_EXACT = 0
+TT_LOWER = 1  # fail high: the real score is at least this
+TT_UPPER = 2  # fail low: the real score is at most this
+
+# Approximate size of one stored entry: the tuple plus its key, score and move ints
+TT_ENTRY_BYTES = 240
+
+
+def packMove(move):
+    """Encode a chess.Move as a small int for the transposition table"""
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def unpackMove(packed):
+    """Decode packMove() back to a chess.Move"""
+    return chess.Move(packed & 63, packed >> 6 & 63, packed >> 12 or None)
+
+
+class TranspositionTable():
+    """
+    Fixed-size hash table of search results keyed by GameState.zobristKey.
+    Each bucket has a depth-preferred slot, replaced only by deeper (or newer)
+    results, and an always-replace slot that takes everything else. A result
+    of this search for a position does not replace a deeper one unless it is
+    exact; the deeper entry only takes the new move.
+    Entries are tuples (key, depth, score, bound, packed best move, generation).
+    """
+    
+    def __init__(self, sizeMB=TT_SIZE_MB):
+        self.resize(sizeMB)
+    
+    def resize(self, sizeMB):
+        """Allocate an empty table using at most about sizeMB megabytes"""
+        self.sizeMB = sizeMB
+        self.buckets = max(1, int(sizeMB * 1024 * 1024) // (2 * TT_ENTRY_BYTES))
+        self.clear()
+    
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        self.entries = [None] * (2 * self.buckets)
+        self.generation = 0
+        self.stored = 0
+        self.resetStats()
+    
+    def resetStats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0  # entries of a different position overwritten by a store
+    
+    def newSearch(self):
+        """Start a new search: older entries become replaceable in the depth-preferred slot"""
+        self.generation += 1
+        self.resetStats()
+    
+    def probe(self, key):
+        """Return the entry stored for key, or None"""
+        index = (key % self.buckets) * 2
+        entries = self.entries
+        entry = entries[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = entries[index + 1]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+    
+    def store(self, key, depth, score, bound, move):
+        """Store a search result, move is a chess.Move or None"""
+        index = (key % self.buckets) * 2
+        entries = self.entries
+        for slot in (index, index + 1):
+            old = entries[slot]
+            if old is not None and old[0] == key and depth < old[1] and bound != TT_EXACT \
+                    and old[5] == self.generation:
+                if move:
+                    entries[slot] = (key, old[1], old[2], old[3], packMove(move), old[5])
+                return
+        entry = (key, depth, score, bound, packMove(move) if move else 0, self.generation)
+        preferred = entries[index]
+        if preferred is None or preferred[0] == key or depth >= preferred[1] or preferred[5] != self.generation:
+            # Depth-preferred slot; the replaced entry moves down if it was another position
+            if preferred is None:
+                self.stored += 1
+            elif preferred[0] != key:
+                self._storeAlways(index + 1, preferred)
+            entries[index] = entry
+        else:
+            self._storeAlways(index + 1, entry)
+    
+    def _storeAlways(self, index, entry):
+        old = self.entries[index]
+        if old is None:
+            self.stored += 1
+        elif old[0] != entry[0]:
+            self.collisions += 1
+        self.entries[index] = entry
+    
+    def stats(self):
+        """Counters for sizing the table: hits, misses, collisions and fill rate"""
+        probes = self.hits + self.misses
+        return {
+            "sizeMB": self.sizeMB,
+            "entries": len(self.entries),
+            "filled": self.stored / len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / probes if probes else 0.0,
+            "collisions": self.collisions,
+        }
+
+
+transpositionTable = TranspositionTable()
+
+
+# Shared table layout in 64-bit words: [generation, buckets, entries...] where
+# every entry is (key ^ data, data) and data packs, from the low bits up,
+# score in centipawns + SHARED_SCORE_OFFSET (30 bits), depth (8), bound (2),
+# generation (8) and the packed move (16)
+SHARED_TT_ENTRY_BYTES = 16
+SHARED_TT_HEADER_WORDS = 2
+SHARED_SCORE_OFFSET = 1 << 29
+
+
+def _sharedScore(score, bound):
+    """
+    score in whole centipawns for the shared table. Null-window results lie
+    between the centipawns, so bounds are rounded the safe way: a lower bound
+    down and an upper bound up, never claiming more than the search proved.
+    """
+    centipawns = round(score * 100, 6)  # Drop the float noise of score * 100 first
+    if bound == TT_LOWER:
+        return math.floor(centipawns)
+    if bound == TT_UPPER:
+        return math.ceil(centipawns)
+    return round(centipawns)
+
+
+class SharedTranspositionTable():
+    """
+    TranspositionTable in multiprocessing.shared_memory, for searches running
+    in several processes at once. Entries are written without locks as two
+    words, the key xor the data and the data; a torn or overwritten entry no
+    longer xors back to its key and reads as a miss.
+    Create it with a size in the owning process and attach with name= elsewhere.
+    """
+    
+    def __init__(self, sizeMB=TT_SIZE_MB, name=None):
+        if name is None:
+            buckets = max(1, int(sizeMB * 1024 * 1024) // (2 * SHARED_TT_ENTRY_BYTES))
+            words = SHARED_TT_HEADER_WORDS + 4 * buckets
+            self.memory = shared_memory.SharedMemory(create=True, size=words * 8)
+            self.words = self.memory.buf.cast('Q')
+            self.words[1] = buckets
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            self.words = self.memory.buf.cast('Q')
+        self.name = self.memory.name
+        self.buckets = self.words[1]
+        self.sizeMB = self.buckets * 2 * SHARED_TT_ENTRY_BYTES / (1024 * 1024)
+        self.generation = self.words[0]
+        self.resetStats()
+    
+    def close(self, unlink=False):
+        """Detach from the shared memory, and free it if unlink (owner only)"""
+        self.words.release()
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+    
+    def clear(self):
+        """Drop every entry and reset the counters (no other process may be searching)"""
+        words = self.words
+        for index in range(SHARED_TT_HEADER_WORDS, len(words)):
+            words[index] = 0
+        self.resetStats()
+    
+    def resetStats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+    
+    def nextGeneration(self):
+        """Age the entries of earlier searches, called by the owner before a new search"""
+        self.words[0] = (self.words[0] + 1) & 255
+    
+    def newSearch(self):
+        """Start a new search in this process at the current shared generation"""
+        self.generation = self.words[0]
+        self.resetStats()
+    
+    def _read(self, index, key):
+        """Entry tuple at word index if it verifies against key, else None"""
+        data = self.words[index + 1]
+        if self.words[index] ^ data != key or not data:
+            return None
+        return (key, data >> 30 & 255, ((data & 0x3FFFFFFF) - SHARED_SCORE_OFFSET) / 100,
+                data >> 38 & 3, data >> 48, data >> 40 & 255)
+    
+    def probe(self, key):
+        """Return the entry stored for key, or None"""
+        index = SHARED_TT_HEADER_WORDS + (key % self.buckets) * 4
+        entry = self._read(index, key) or self._read(index + 2, key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+    
+    def store(self, key, depth, score, bound, move):
+        """Store a search result, move is a chess.Move or None"""
+        words = self.words
+        index = SHARED_TT_HEADER_WORDS + (key % self.buckets) * 4
+        for slot in (index, index + 2):
+            old_data = words[slot + 1]
+            if old_data and words[slot] ^ old_data == key and depth < (old_data >> 30 & 255) \
+                    and bound != TT_EXACT and (old_data >> 40 & 255) == self.generation:
+                # Keep the deeper result of this position, as TranspositionTable does
+                if move:
+                    old_data = old_data & 0xFFFFFFFFFFFF | packMove(move) << 48
+                    words[slot + 1] = old_data
+                    words[slot] = key ^ old_data
+                return
+        data = (_sharedScore(score, bound) + SHARED_SCORE_OFFSET) | min(depth, 255) << 30 | bound << 38 \
+            | self.generation << 40 | (packMove(move) if move else 0) << 48
+        preferred_data = words[index + 1]
+        preferred_key = words[index] ^ preferred_data
+        if not preferred_data or preferred_key == key or depth >= (preferred_data >> 30 & 255) \
+                or (preferred_data >> 40 & 255) != self.generation:
+            # Depth-preferred slot; the replaced entry moves down if it was another position
+            if preferred_data and preferred_key != key:
+                self._storeAlways(index + 2, preferred_key, preferred_data)
+            words[index + 1] = data
+            words[index] = key ^ data
+        else:
+            self._storeAlways(index + 2, key, data)
+    
+    def _storeAlways(self, index, key, data):
+        words = self.words
+        old_data = words[index + 1]
+        if old_data and words[index] ^ old_data != key:
+            self.collisions += 1
+        words[index + 1] = data
+        words[index] = key ^ data
+    
+    def stats(self):
+        """Counters for sizing the table: hits, misses, collisions and fill rate"""
+        probes = self.hits + self.misses
+        entries = 2 * self.buckets
+        stored = sum(1 for word in self.words[SHARED_TT_HEADER_WORDS + 1::2] if word)
+        return {
+            "sizeMB": self.sizeMB,
+            "entries": entries,
+            "filled": stored / entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / probes if probes else 0.0,
+            "collisions": self.collisions,
+        }
+
+
+# ============================================================================
+# ============================ MOVE ORDERING ===============================
+# ============================================================================
+# Ordering scores: hash move > promotions > captures > killers > counter-move > history
+ORDER_HASH_MOVE = 10000000
+ORDER_PROMOTION = 2000000
+ORDER_CAPTURE = 1000000
+ORDER_KILLER = (900000, 800000)
+ORDER_COUNTER_MOVE = 700000
+# History values are halved when one of them reaches this, so they stay below the bonuses
+HISTORY_LIMIT = 500000
+
+# Two killer slots per ply: quiet moves that caused a beta cutoff at that ply
+killerMoves = [[None, None] for _ in range(MAX_DEPTH + 1)]
+# Butterfly history: historyTable[color][from_square * 64 + to_square]
+historyTable = [[0] * 4096, [0] * 4096]
+# counterMoves[previous from_square * 64 + previous to_square]: quiet reply that refuted it
+counterMoves = [None] * 4096
+
+
+# Most valuable victim / least valuable attacker, from pieceScore:
+# mvvLvaScores[victim_type - 1][attacker_type - 1] with python-chess piece types.
+# The king scores 0 as a victim but attacks last, after the queen
+_pieceTypeSymbols = ["p", "N", "B", "R", "Q", "K"]
+_attackerScore = dict(pieceScore, K=pieceScore["Q"] + 1)
+mvvLvaScores = [[pieceScore[victim] * 10 - _attackerScore[attacker] for attacker in _pieceTypeSymbols]
+                for victim in _pieceTypeSymbols]
+# Promotion bonus by promoted piece type, queen first
+promotionScores = [0, 0] + [pieceScore[symbol] for symbol in _pieceTypeSymbols[1:5]]
+
+
+def captureScore(board, move):
+    """MVV-LVA score of a capture (en passant takes a pawn)"""
+    victim = board.piece_type_at(move.to_square) or chess.PAWN
+    return mvvLvaScores[victim - 1][board.piece_type_at(move.from_square) - 1]
+
+
+def resetMoveOrdering():
+    """Forget killers and counter-moves and age the history table at the start of a search"""
+    for slots in killerMoves:
+        slots[0] = slots[1] = None
+    for table in historyTable:
+        for index in range(4096):
+            table[index] >>= 1
+    counterMoves[:] = [None] * 4096
+
+
+def orderMoves(gs, moves, hash_move, ply):
+    """Sort moves in place, best candidates first, using the enabled searchOptions"""
+    board = gs.board
+    use_mvv_lva = searchOptions["mvv_lva"]
+    if searchOptions["killer_heuristic"]:
+        killers = killerMoves[ply] if ply < len(killerMoves) else (None, None)
+        history = historyTable[board.turn]
+        counter_move = None
+        if board.move_stack:
+            previous = board.move_stack[-1]
+            counter_move = counterMoves[previous.from_square * 64 + previous.to_square]
+    else:
+        killers = (None, None)
+        history = None
+        counter_move = None
+    
+    def orderScore(move):
+        if move == hash_move:
+            return ORDER_HASH_MOVE
+        if move.promotion:
+            return ORDER_PROMOTION + promotionScores[move.promotion]
+        if board.is_capture(move):
+            return ORDER_CAPTURE + (captureScore(board, move) if use_mvv_lva else 0)
+        if history is None:
+            return 0
+        if move == killers[0]:
+            return ORDER_KILLER[0]
+        if move == killers[1]:
+            return ORDER_KILLER[1]
+        if move == counter_move:
+            return ORDER_COUNTER_MOVE
+        return history[move.from_square * 64 + move.to_square]
+    
+    moves.sort(key=orderScore, reverse=True)
+
+
+def recordCutoff(gs, move, depth, ply):
+    """Update killers, history and counter-moves after move caused a beta cutoff"""
+    board = gs.board
+    if move.promotion or board.is_capture(move):
+        return  # only quiet moves are remembered
+    if ply < len(killerMoves):
+        killers = killerMoves[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+    history = historyTable[board.turn]
+    index = move.from_square * 64 + move.to_square
+    history[index] += depth * depth
+    if history[index] >= HISTORY_LIMIT:
+        for table in historyTable:
+            for i in range(4096):
+                table[i] >>= 1
+    if board.move_stack:
+        previous = board.move_stack[-1]
+        counterMoves[previous.from_square * 64 + previous.to_square] = move
+
+
 # ============================================================================
 # ==================== ALPHA-BETA PRUNING ALGORITHM ========================
 # ============================================================================
+class SearchTimeout(Exception):
+    """Raised inside minimax when searchDeadline or searchNodeLimit is reached or searchStopEvent is set"""
+    # (move, score) of the best root move searchRoot finished before the stop, set on the way out
+    best = (None, None)
+
+
+def reportIteration(depth, move, score):
+    """Pass a completed iteration to iterationCallback, if any"""
+    if iterationCallback is not None:
+        iterationCallback(depth, move, score)
+
+
+def checkSearchLimits():
+    """Raise SearchTimeout if the running search has to stop (called every TIME_CHECK_INTERVAL nodes)"""
+    if searchDeadline is not None and time.perf_counter() > searchDeadline:
+        raise SearchTimeout()
+    if searchNodeLimit is not None and nodesSearched + (helperNodeCounter.value if helperNodeCounter else 0) \
+            >= searchNodeLimit:
+        raise SearchTimeout()
+    if searchStopEvent is not None and searchStopEvent.is_set():
+        raise SearchTimeout()
+    if progressCallback is not None:
+        progressCallback()
+
+
 def minimax(gs, depth, alpha, beta, maximizing_player, thinking_queue=None):
-    # Check for terminal conditions
-    if gs.board.is_checkmate():
+    global nodesSearched
+    nodesSearched += 1
+    if nodesSearched % TIME_CHECK_INTERVAL == 0:
+        checkSearchLimits()
+    
+    if depth == 0:
+        if searchOptions["quiescence"]:
+            global quiescenceBudget
+            quiescenceBudget = QUIESCENCE_NODE_LIMIT
+            return quiescence(gs, alpha, beta, maximizing_player)
+        return scoreBoard(gs)
+    
+    # Transposition table: reuse a deep enough result, or at least its best move
+    key = gs.zobristKey
+    entry = transpositionTable.probe(key)
+    hash_move = None
+    if entry is not None:
+        _, entry_depth, entry_score, entry_bound, entry_move, _ = entry
+        if entry_depth >= depth:
+            if entry_bound == TT_EXACT:
+                return entry_score
+            if entry_bound == TT_LOWER and entry_score >= beta:
+                return entry_score
+            if entry_bound == TT_UPPER and entry_score <= alpha:
+                return entry_score
+        if entry_move:
+            hash_move = unpackMove(entry_move)
+    
+    # Check for terminal conditions, reusing the moves generated for this node
+    moves = list(gs.board.legal_moves)
+    outcome = gs.outcome(moves)
+    if outcome == OUTCOME_CHECKMATE:
         if gs.whiteToMove:
             return -CHECKMATE  # Black wins
         else:
             return CHECKMATE   # White wins
-    elif gs.board.is_stalemate() or gs.board.is_insufficient_material() or gs.board.is_seventyfive_moves() or gs.board.is_fivefold_repetition():
+    elif outcome is not None:
         return STALEMATE
     
-    if depth == 0:
-        return scoreBoard(gs)
+    # Null move: if passing still fails high, a real move will too. Only when the
+    # static score already beats the bound, not in check, not twice in a row and
+    # not without pieces (zugzwang in pawn endings)
+    board = gs.board
+    in_check = board.is_check()
+    if searchOptions["null_move"] and depth >= NULL_MOVE_MIN_DEPTH and not in_check \
+            and board.move_stack and board.move_stack[-1] \
+            and board.occupied_co[board.turn] & ~(board.pawns | board.kings) \
+            and (staticScore(gs) >= beta if maximizing_player else staticScore(gs) <= alpha):
+        gs.push_null()
+        try:
+            if maximizing_player:
+                null_score = minimax(gs, depth - 1 - NULL_MOVE_REDUCTION, beta - NULL_WINDOW, beta,
+                                     False, thinking_queue)
+            else:
+                null_score = minimax(gs, depth - 1 - NULL_MOVE_REDUCTION, alpha, alpha + NULL_WINDOW,
+                                     True, thinking_queue)
+        finally:
+            gs.pop_trusted()
+        # Do not claim a mate found by passing
+        if maximizing_player and null_score >= beta:
+            return beta if null_score >= CHECKMATE else null_score
+        if not maximizing_player and null_score <= alpha:
+            return alpha if null_score <= -CHECKMATE else null_score
+    
+    # Search the hash move first, then killers/history when enabled
+    ply = len(gs.board.move_stack) - searchRootPly
+    use_killers = searchOptions["killer_heuristic"]
+    if use_killers or searchOptions["mvv_lva"]:
+        orderMoves(gs, moves, hash_move, ply)
+    elif hash_move is not None and hash_move in moves:
+        moves.remove(hash_move)
+        moves.insert(0, hash_move)
     
+    alpha_original, beta_original = alpha, beta
+    best_move = None
+    use_pvs = searchOptions["pvs"]
+    use_lmr = searchOptions["lmr"] and depth >= LMR_MIN_DEPTH and not in_check
     if maximizing_player:
         max_eval = -CHECKMATE
-        for move in gs.getValidMoves():
-            gs.makeMove(move)
-            eval_score = minimax(gs, depth - 1, alpha, beta, False, thinking_queue)
-            gs.undoMove()
-            max_eval = max(max_eval, eval_score)
+        for move_index, move in enumerate(moves):
+            reduce = use_lmr and move_index >= LMR_FULL_DEPTH_MOVES and not move.promotion \
+                and not board.is_capture(move)
+            gs.push_trusted(move)
+            full_search = True
+            if reduce and not board.is_check():
+                # Late quiet move: a shallower null-window search, re-searched if it beats alpha
+                eval_score = minimax(gs, depth - 1 - LMR_REDUCTION, alpha, alpha + NULL_WINDOW,
+                                     False, thinking_queue)
+                full_search = eval_score > alpha
+            if not full_search:
+                pass  # The reduced search already proved the move no better
+            elif use_pvs and best_move is not None:
+                # Prove the move is no better than alpha, search it fully if not
+                eval_score = minimax(gs, depth - 1, alpha, alpha + NULL_WINDOW, False, thinking_queue)
+                if alpha < eval_score < beta:
+                    eval_score = minimax(gs, depth - 1, alpha, beta, False, thinking_queue)
+            else:
+                eval_score = minimax(gs, depth - 1, alpha, beta, False, thinking_queue)
+            gs.pop_trusted()
+            if eval_score > max_eval or best_move is None:
+                max_eval = eval_score
+                best_move = move
             alpha = max(alpha, eval_score)
             if beta <= alpha:
+                if use_killers:
+                    recordCutoff(gs, move, depth, ply)
                 break  # Alpha-beta pruning
-        return max_eval
+        best_score = max_eval
     else:
         min_eval = CHECKMATE
-        for move in gs.getValidMoves():
-            gs.makeMove(move)
-            eval_score = minimax(gs, depth - 1, alpha, beta, True, thinking_queue)
-            gs.undoMove()
-            min_eval = min(min_eval, eval_score)
+        for move_index, move in enumerate(moves):
+            reduce = use_lmr and move_index >= LMR_FULL_DEPTH_MOVES and not move.promotion \
+                and not board.is_capture(move)
+            gs.push_trusted(move)
+            full_search = True
+            if reduce and not board.is_check():
+                eval_score = minimax(gs, depth - 1 - LMR_REDUCTION, beta - NULL_WINDOW, beta,
+                                     True, thinking_queue)
+                full_search = eval_score < beta
+            if not full_search:
+                pass  # The reduced search already proved the move no better
+            elif use_pvs and best_move is not None:
+                eval_score = minimax(gs, depth - 1, beta - NULL_WINDOW, beta, True, thinking_queue)
+                if alpha < eval_score < beta:
+                    eval_score = minimax(gs, depth - 1, alpha, beta, True, thinking_queue)
+            else:
+                eval_score = minimax(gs, depth - 1, alpha, beta, True, thinking_queue)
+            gs.pop_trusted()
+            if eval_score < min_eval or best_move is None:
+                min_eval = eval_score
+                best_move = move
             beta = min(beta, eval_score)
             if beta <= alpha:
+                if use_killers:
+                    recordCutoff(gs, move, depth, ply)
                 break  # Alpha-beta pruning
-        return min_eval
+        best_score = min_eval
+    
+    if best_score <= alpha_original:
+        bound = TT_UPPER
+    elif best_score >= beta_original:
+        bound = TT_LOWER
+    else:
+        bound = TT_EXACT
+    transpositionTable.store(key, depth, best_score, bound, best_move)
+    return best_score
+
+
+def quiescence(gs, alpha, beta, maximizing_player):
+    """
+    Resolve captures below a leaf so it is not scored mid-exchange.
+    The side to move may stand pat on the static score, captures that cannot
+    lift it back to the window are skipped (delta pruning), and check evasions
+    are searched in full. Stops on QUIESCENCE_NODE_LIMIT nodes per leaf.
+    """
+    global nodesSearched, quiescenceNodes, quiescenceBudget
+    nodesSearched += 1
+    quiescenceNodes += 1
+    quiescenceBudget -= 1
+    if nodesSearched % TIME_CHECK_INTERVAL == 0:
+        checkSearchLimits()
+    
+    outcome = gs.outcome()
+    if outcome == OUTCOME_CHECKMATE:
+        return -CHECKMATE if gs.whiteToMove else CHECKMATE
+    elif outcome is not None:
+        return STALEMATE
+    
+    board = gs.board
+    in_check = board.is_check()
+    stand_pat = staticScore(gs)
+    if not in_check:
+        if quiescenceBudget <= 0:
+            return stand_pat
+        if maximizing_player:
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+        else:
+            if stand_pat <= alpha:
+                return stand_pat
+            beta = min(beta, stand_pat)
+        moves = list(board.generate_legal_captures())
+        moves.sort(key=lambda move: captureScore(board, move), reverse=True)
+    else:
+        # No standing pat in check: every evasion, captures first
+        moves = list(board.legal_moves)
+        moves.sort(key=board.is_capture, reverse=True)
+    
+    best = stand_pat if not in_check else (-CHECKMATE if maximizing_player else CHECKMATE)
+    for move in moves:
+        if not in_check and not move.promotion:
+            # Delta pruning: even winning the piece for free stays outside the window
+            victim = board.piece_type_at(move.to_square) or chess.PAWN
+            gain = pieceScore[_pieceTypeSymbols[victim - 1]] + DELTA_MARGIN
+            if (stand_pat + gain <= alpha) if maximizing_player else (stand_pat - gain >= beta):
+                continue
+        gs.push_trusted(move)
+        score = quiescence(gs, alpha, beta, not maximizing_player)
+        gs.pop_trusted()
+        if maximizing_player:
+            best = max(best, score)
+            alpha = max(alpha, score)
+        else:
+            best = min(best, score)
+            beta = min(beta, score)
+        if beta <= alpha:
+            break
+    return best
 
 
 def scoreBoard(gs):
@@ -161,101 +872,680 @@ def scoreBoard(gs):
     Score the board based on material and positional values
     Positive score favors white, negative score favors black
     """
-    # Check for terminal conditions using python-chess board directly
-    if gs.board.is_checkmate():
+    # Check for terminal conditions (memoized per position by GameState)
+    outcome = gs.outcome()
+    if outcome == OUTCOME_CHECKMATE:
         if gs.whiteToMove:
             return -CHECKMATE  # Black wins
         else:
             return CHECKMATE   # White wins
-    elif gs.board.is_stalemate() or gs.board.is_insufficient_material() or gs.board.is_seventyfive_moves() or gs.board.is_fivefold_repetition():
+    elif outcome is not None:
         return STALEMATE
+    return staticScore(gs)
+
+
+def staticScore(gs):
+    """scoreBoard without the terminal checks, for positions known to be playable"""
+    if gs.evalTables is not pieceSquareTables:
+        return evaluateBoard(gs.board) / 100
     
+    # O(1): sums are kept up to date by push_trusted/pop_trusted
+    black_sum, white_sum = gs.evalSums
+    if DEBUG_EVALUATION:
+        full_score = evaluateBoard(gs.board)
+        if white_sum - black_sum != full_score:
+            raise AssertionError(f"Incremental evaluation {white_sum - black_sum} != "
+                                 f"full evaluation {full_score} at {gs.board.fen()}")
+    return (white_sum - black_sum) / 100
+
+
+def evaluateBoard(board):
+    """
+    Material plus positional score in integer centipawns straight from the
+    python-chess bitboards, only visiting occupied squares.
+    scoreBoard(gs) == evaluateBoard(gs.board) / 100 for non-terminal positions.
+    """
     score = 0
-    board_array = gs.get_board_array()  # Get 2D array representation
-    
-    for row in range(len(board_array)):
-        for col in range(len(board_array[row])):
-            square = board_array[row][col]
-            if square != "--":
-                # Material value
-                piece_type = square[1]
-                piece_value = pieceScore[piece_type]
-                
-                # Positional value
-                positional_value = 0
-                if piece_type == "p":
-                    if square[0] == "w":
-                        positional_value = whitePawnScores[row][col]
-                    else:
-                        positional_value = blackPawnScores[row][col]
-                elif piece_type in piecePositionScores:
-                    positional_value = piecePositionScores[piece_type][row][col]
-                
-                total_value = piece_value + positional_value * 0.1
-                
-                if square[0] == "w":
-                    score += total_value
-                else:
-                    score -= total_value
-    
+    white = board.occupied_co[chess.WHITE]
+    black_tables, white_tables = pieceSquareTables
+    pieces = (board.pawns, board.knights, board.bishops, board.rooks, board.queens)
+    for piece_type, bitboard in enumerate(pieces, chess.PAWN):
+        white_table = white_tables[piece_type]
+        black_table = black_tables[piece_type]
+        own = bitboard & white
+        while own:
+            square = own.bit_length() - 1
+            score += white_table[square]
+            own ^= 1 << square
+        other = bitboard & ~white
+        while other:
+            square = other.bit_length() - 1
+            score -= black_table[square]
+            other ^= 1 << square
     return score
 
 
-def findBestMoveAlphaBeta(gs, validMoves, thinking_queue=None, ai_info=None):
+def searchRoot(gs, rootMoves, depth, thinking_queue=None, alpha=-CHECKMATE, beta=CHECKMATE):
     """
-    Find the best move using minimax with alpha-beta pruning
+    Search every root move to depth with minimax and return
+    (best move, best score, [(move, score), ...]) from the side to move's view.
+    rootMoves are GUI Move objects legal in gs.
+    With the pvs option the best score so far narrows the window of the later
+    moves, which are searched with a null window first; their scores are then
+    only bounds. A best score outside (alpha, beta) means the search failed
+    low or high and has to be repeated with a wider window.
+    A SearchTimeout leaving it carries the best of the moves searched to the end.
     """
-    global nextMove, current_search_id
-    nextMove = None
-    current_search_id += 1
-    
-    if thinking_queue:
-        separator = "-" * 60
-        thinking_queue.put(separator)
-        if ai_info:
-            thinking_queue.put(f"AI {ai_info['color']} [Alpha-Beta] is analyzing...")
-        else:
-            thinking_queue.put("AI [Alpha-Beta] is analyzing...")
-        thinking_queue.put(f"Analyzing {len(validMoves)} possible moves at depth {DEPTH}")
-    
     # Save the original player before the loop (critical fix)
     player_is_white = gs.whiteToMove
+    use_pvs = searchOptions["pvs"]
+    alpha_original, beta_original = alpha, beta
     
     # Start minimax with alpha-beta pruning
     best_move = None
     best_score = -CHECKMATE if player_is_white else CHECKMATE
+    scores = []
     
-    for move in validMoves:
-        gs.makeMove(move)
-        score = minimax(gs, DEPTH - 1, -CHECKMATE, CHECKMATE, 
-                       not player_is_white, thinking_queue)
-        gs.undoMove()
+    for move in rootMoves:
+        # Root moves come from getValidMoves, so they are legal here
+        gs.push_trusted(gs._convert_to_chess_move(move))
+        try:
+            if not use_pvs:
+                score = minimax(gs, depth - 1, -CHECKMATE, CHECKMATE,
+                                not player_is_white, thinking_queue)
+            elif best_move is None:
+                score = minimax(gs, depth - 1, alpha, beta, not player_is_white, thinking_queue)
+            elif player_is_white:
+                score = minimax(gs, depth - 1, alpha, alpha + NULL_WINDOW, False, thinking_queue)
+                if alpha < score < beta:
+                    score = minimax(gs, depth - 1, alpha, beta, False, thinking_queue)
+            else:
+                score = minimax(gs, depth - 1, beta - NULL_WINDOW, beta, True, thinking_queue)
+                if alpha < score < beta:
+                    score = minimax(gs, depth - 1, alpha, beta, True, thinking_queue)
+        except SearchTimeout as timeout:
+            timeout.best = (best_move, best_score if best_move is not None else None)
+            raise
+        finally:
+            gs.pop_trusted()
+        scores.append((move, score))
         
         # Use original player perspective, not the flipped gs.whiteToMove
         if player_is_white:
-            if score > best_score:
+            if score > best_score or best_move is None:
                 best_score = score
                 best_move = move
         else:
-            if score < best_score:
+            if score < best_score or best_move is None:
                 best_score = score
                 best_move = move
-                
+        
+        if use_pvs:
+            if player_is_white:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if beta <= alpha:
+                break  # Failed high (or low for black) on the aspiration window
+    
+    if best_move is not None:
+        if best_score <= alpha_original:
+            bound = TT_UPPER
+        elif best_score >= beta_original:
+            bound = TT_LOWER
+        else:
+            bound = TT_EXACT
+        transpositionTable.store(gs.zobristKey, depth, best_score, bound,
+                                 gs._convert_to_chess_move(best_move))
+    return best_move, best_score, scores
+
+
+def searchAspiration(gs, rootMoves, depth, previousScore, thinking_queue=None):
+    """
+    searchRoot in a narrow window around previousScore, widening the side that
+    failed through ASPIRATION_WINDOWS until the score falls inside the window
+    """
+    alpha_step = beta_step = 0
+    while True:
+        alpha = previousScore - ASPIRATION_WINDOWS[alpha_step] \
+            if alpha_step < len(ASPIRATION_WINDOWS) else -CHECKMATE
+        beta = previousScore + ASPIRATION_WINDOWS[beta_step] \
+            if beta_step < len(ASPIRATION_WINDOWS) else CHECKMATE
+        best_move, best_score, scores = searchRoot(gs, rootMoves, depth, thinking_queue, alpha, beta)
+        if best_score <= alpha and alpha > -CHECKMATE:
+            alpha_step += 1
+        elif best_score >= beta and beta < CHECKMATE:
+            beta_step += 1
+        else:
+            return best_move, best_score, scores
+        if thinking_queue:
+            thinking_queue.put((EVENT_RESEARCH, {"depth": depth, "score": best_score, "alpha": alpha, "beta": beta}))
+
+
+def _prepareSearch(gs, validMoves):
+    """Common setup of a search: counters, incremental evaluation and hash move ordering"""
+    global current_search_id, nodesSearched, quiescenceNodes, searchRootPly
+    current_search_id += 1
+    nodesSearched = 0
+    quiescenceNodes = 0
+    searchRootPly = len(gs.board.move_stack)
+    if searchOptions["killer_heuristic"]:
+        resetMoveOrdering()
+    
+    # Leaf evaluation is read from sums updated on every push/pop
+    if gs.evalTables is not pieceSquareTables:
+        gs.trackEvaluation(pieceSquareTables)
+    
+    # Search the root move stored by an earlier search of this position first
+    transpositionTable.newSearch()
+    entry = transpositionTable.probe(gs.zobristKey)
+    if entry is not None and entry[4]:
+        hash_move = unpackMove(entry[4])
+        validMoves = sorted(validMoves, key=lambda move: gs._convert_to_chess_move(move) != hash_move)
+    return validMoves
+
+
+def principalVariation(gs, move, maxLength):
+    """
+    Expected line starting with the root move, as UCI strings: move followed
+    by the hash moves of the transposition table for as long as they are legal
+    """
+    first = gs._convert_to_chess_move(move)
+    pv = [first.uci()]
+    stack_size = len(gs.board.move_stack)
+    gs.push_trusted(first)
+    try:
+        while len(pv) < maxLength:
+            entry = transpositionTable.probe(gs.zobristKey)
+            if entry is None or not entry[4]:
+                break
+            hash_move = unpackMove(entry[4])
+            if not gs.board.is_legal(hash_move):
+                break  # Another position's move stored under the same bucket key
+            pv.append(hash_move.uci())
+            gs.push_trusted(hash_move)
+    finally:
+        while len(gs.board.move_stack) > stack_size:
+            gs.pop_trusted()
+    return pv
+
+
+def _iterationEvent(gs, depth, move, score, startTime):
+    return (EVENT_ITERATION, dict(depth=depth, move=gs._convert_to_chess_move(move).uci(), score=score,
+                                  pv=principalVariation(gs, move, depth), **progressFields(startTime)))
+
+
+def _rootMovesEvent(gs, depth, scores):
+    return (EVENT_ROOT_MOVES, {"depth": depth,
+                               "scores": [(gs._convert_to_chess_move(move).uci(), score) for move, score in scores]})
+
+
+def _putSearchEnd(gs, thinking_queue, best_move, best_score, depth):
+    """Table statistics and the chosen move, the last events of a search"""
+    thinking_queue.put((EVENT_TABLE, transpositionTable.stats()))
+    thinking_queue.put((EVENT_BEST_MOVE, {"move": gs._convert_to_chess_move(best_move).uci() if best_move else None,
+                                          "score": best_score, "depth": depth}))
+
+
+def findBestMoveAlphaBeta(gs, validMoves, thinking_queue=None, ai_info=None):
+    """
+    Find the best move using minimax with alpha-beta pruning.
+    A stopped search returns the best of the root moves it searched to the
+    end, or the first root move if it did not finish any.
+    """
+    global nextMove
+    nextMove = None
+    start_time = time.perf_counter()
+    
+    if thinking_queue:
+        thinking_queue.put(_startEvent(ai_info, "Alpha-Beta", validMoves, depth=DEPTH))
+    
+    validMoves = _prepareSearch(gs, validMoves)
+    stack_size = len(gs.board.move_stack)
+    try:
+        best_move, best_score, scores = searchRoot(gs, validMoves, DEPTH, thinking_queue)
+    except SearchTimeout as timeout:
+        # Unwind the moves the interrupted search left on the board
+        while len(gs.board.move_stack) > stack_size:
+            gs.pop_trusted()
+        best_move, best_score = timeout.best
+        if best_move is None and validMoves:
+            best_move = validMoves[0]
         if thinking_queue:
-            thinking_queue.put(f"Move {move}: Score = {score}")
+            _putSearchEnd(gs, thinking_queue, best_move, best_score, DEPTH)
+        nextMove = best_move
+        return best_move
+    reportIteration(DEPTH, best_move, best_score)
+    
+    if thinking_queue:
+        thinking_queue.put(_rootMovesEvent(gs, DEPTH, scores))
+        if best_move is not None:
+            thinking_queue.put(_iterationEvent(gs, DEPTH, best_move, best_score, start_time))
+        _putSearchEnd(gs, thinking_queue, best_move, best_score, DEPTH)
+    
+    nextMove = best_move
+    return best_move
+
+
+# ============================================================================
+# ===================== ITERATIVE DEEPENING ALGORITHM ======================
+# ============================================================================
+def findBestMoveIterativeDeepening(gs, validMoves, thinking_queue=None, ai_info=None,
+                                   timeLimit=MOVE_TIME_LIMIT, maxDepth=MAX_DEPTH, fullTime=False):
+    """
+    Search depth 1, 2, 3... until timeLimit seconds have passed and return the
+    best move of the deepest completed iteration. Each iteration searches the
+    previous best move first and the other root moves by their previous score.
+    No new iteration starts after half of timeLimit, unless fullTime (a fixed
+    move time to use up, as UCI movetime).
+    """
+    global nextMove, searchDeadline
+    nextMove = None
+    start_time = time.perf_counter()
+    
+    if thinking_queue:
+        thinking_queue.put(_startEvent(ai_info, "Alpha-Beta + Iterative Deepening", validMoves,
+                                       time_limit=timeLimit))
+    
+    root_moves = _prepareSearch(gs, validMoves)
+    player_is_white = gs.whiteToMove
+    stack_size = len(gs.board.move_stack)
+    
+    # A move is always ready, even if the first iteration does not finish
+    best_move = root_moves[0] if root_moves else None
+    best_score = None
+    completed_depth = 0
+    
+    searchDeadline = start_time + timeLimit
+    try:
+        for depth in range(1, maxDepth + 1):
+            try:
+                if searchOptions["pvs"] and best_score is not None and abs(best_score) < CHECKMATE:
+                    move, score, scores = searchAspiration(gs, root_moves, depth, best_score, thinking_queue)
+                else:
+                    move, score, scores = searchRoot(gs, root_moves, depth, thinking_queue)
+            except SearchTimeout:
+                # Unwind the moves the interrupted search left on the board
+                while len(gs.board.move_stack) > stack_size:
+                    gs.pop_trusted()
+                break
+            best_move, best_score, completed_depth = move, score, depth
+            reportIteration(depth, best_move, best_score)
+            
+            if thinking_queue:
+                thinking_queue.put(_iterationEvent(gs, depth, best_move, best_score, start_time))
+            
+            # Best first, then the rest by this iteration's scores (moves cut off
+            # by a fail high keep their previous order at the end)
+            scores.sort(key=lambda item: item[1], reverse=player_is_white)
+            root_moves = [move for move, _ in scores] + root_moves[len(scores):]
+            
+            # A forced mate will not change with more depth
+            if abs(best_score) >= CHECKMATE:
+                break
+            # An iteration takes several times longer than the previous one
+            if not fullTime and time.perf_counter() - start_time > timeLimit / 2:
+                break
+    finally:
+        searchDeadline = None
     
     if thinking_queue:
-        thinking_queue.put(f"Best move selected: {best_move} (Score: {best_score})")
-        thinking_queue.put(separator)
+        _putSearchEnd(gs, thinking_queue, best_move, best_score, completed_depth)
     
     nextMove = best_move
     return best_move
 
 
-def findBestMove(gs, validMoves, returnQueue, ai_algorithms=None, thinking_queue=None, ai_info=None):
+# ============================================================================
+# ======================== PARALLEL ROOT SEARCH ============================
+# ============================================================================
+# Pool of the running process: (workers, pool, shared bound, stop event), created on first use
+_parallelPool = None
+# In a pool worker: the shared bound and (search id, GameState) of the current search
+_parallelBound = None
+_workerSearch = None
+
+
+def _initParallelWorker(bound, stopEvent):
+    global _parallelBound, searchStopEvent, progressCallback, iterationCallback, searchDeadline, searchNodeLimit
+    _parallelBound = bound
+    searchStopEvent = stopEvent
+    # Progress, time and node limits belong to the process that created the pool,
+    # which stops the workers through stopEvent
+    progressCallback = None
+    iterationCallback = None
+    searchDeadline = None
+    searchNodeLimit = None
+
+
+def _getParallelPool(workers):
+    """The process pool for parallel root search, recreated if the worker count changes"""
+    global _parallelPool
+    if _parallelPool is not None and _parallelPool[0] != workers:
+        shutdownParallelPool()
+    if _parallelPool is None:
+        bound = multiprocessing.Value('d', 0.0)
+        stop_event = multiprocessing.Event()
+        pool = multiprocessing.Pool(workers, initializer=_initParallelWorker, initargs=(bound, stop_event))
+        _parallelPool = (workers, pool, bound, stop_event)
+    return _parallelPool
+
+
+def shutdownParallelPool():
+    """Stop the worker processes of the parallel root search"""
+    global _parallelPool
+    if _parallelPool is not None:
+        _parallelPool[1].terminate()
+        _parallelPool[1].join()
+        _parallelPool = None
+
+
+def _searchRootMoveTask(task):
+    """
+    Pool worker: search one root move with the best score found so far by any
+    worker as the bound. Returns (root index, score, nodes); a score that
+    does not beat the bound is only an upper bound (lower bound for black).
+    """
+    global _workerSearch, searchRootPly, nodesSearched, quiescenceNodes
+    search_id, snapshot, options, depth, index, uci = task
+    checkSearchLimits()  # Queued tasks of a stopped search end right away
+    if _workerSearch is None or _workerSearch[0] != search_id:
+        # First move of a new search in this worker: same setup as _prepareSearch
+        nodesSearched = 0
+        quiescenceNodes = 0
+        searchOptions.update(options)
+        gs = GameState.from_snapshot(snapshot)
+        gs.trackEvaluation(pieceSquareTables)
+        searchRootPly = len(gs.board.move_stack)
+        resetMoveOrdering()
+        transpositionTable.newSearch()
+        _workerSearch = (search_id, gs)
+    gs = _workerSearch[1]
+    player_is_white = gs.whiteToMove
+    
+    # Half a centipawn below the bound, so a move equal to the best is still scored exactly
+    bound = _parallelBound.value
+    if player_is_white:
+        alpha, beta = bound - NULL_WINDOW, CHECKMATE
+    else:
+        alpha, beta = -CHECKMATE, bound + NULL_WINDOW
+    
+    nodes_before = nodesSearched
+    stack_size = len(gs.board.move_stack)
+    gs.push_trusted(chess.Move.from_uci(uci))
+    try:
+        score = minimax(gs, depth - 1, alpha, beta, not player_is_white)
+    finally:
+        # Also unwinds a search stopped by searchStopEvent
+        while len(gs.board.move_stack) > stack_size:
+            gs.pop_trusted()
+    
+    with _parallelBound.get_lock():
+        if (score > _parallelBound.value) if player_is_white else (score < _parallelBound.value):
+            _parallelBound.value = score
+    return index, score, nodesSearched - nodes_before
+
+
+def findBestMoveParallel(gs, validMoves, thinking_queue=None, ai_info=None, workers=PARALLEL_WORKERS):
+    """
+    Fixed-depth alpha-beta with the root moves spread over a process pool.
+    The first root move is searched here to get a bound (young brothers wait),
+    the others in the workers, which share the best score so far so later
+    moves are still cut off. Picks the same move as findBestMoveAlphaBeta as
+    long as no enabled option depends on the window (quiescence, null move, LMR).
+    A stopped search returns the best of the root moves searched to the end.
+    """
+    global nextMove, nodesSearched
+    nextMove = None
+    start_time = time.perf_counter()
+    
+    if thinking_queue:
+        thinking_queue.put(_startEvent(ai_info, f"Alpha-Beta, {workers} workers", validMoves, depth=DEPTH))
+    
+    root_moves = _prepareSearch(gs, validMoves)
+    if not root_moves:
+        return None
+    player_is_white = gs.whiteToMove
+    
+    # Eldest brother first, in this process
+    stack_size = len(gs.board.move_stack)
+    try:
+        best_move, best_score, _ = searchRoot(gs, root_moves[:1], DEPTH, thinking_queue)
+    except SearchTimeout:
+        while len(gs.board.move_stack) > stack_size:
+            gs.pop_trusted()
+        if thinking_queue:
+            _putSearchEnd(gs, thinking_queue, root_moves[0], None, DEPTH)
+        nextMove = root_moves[0]
+        return nextMove
+    results = {0: best_score}
+    stopped = False
+    
+    _, pool, bound, stop_event = _getParallelPool(workers)
+    bound.value = best_score
+    snapshot = gs.snapshot()
+    options = dict(searchOptions)
+    tasks = [(current_search_id, snapshot, options, DEPTH, index, gs._convert_to_chess_move(move).uci())
+             for index, move in enumerate(root_moves[1:], 1)]
+    pending = pool.imap_unordered(_searchRootMoveTask, tasks)
+    try:
+        for _ in tasks:
+            while True:
+                try:
+                    index, score, nodes = pending.next(timeout=PARALLEL_POLL_INTERVAL)
+                    break
+                except multiprocessing.TimeoutError:
+                    checkSearchLimits()
+            results[index] = score
+            nodesSearched += nodes
+    except SearchTimeout:
+        # Stop the workers too and wait until the pool is idle again, keeping
+        # the moves that still finished
+        stopped = True
+        stop_event.set()
+        for _ in range(len(tasks) - len(results) + 1):
+            try:
+                index, score, nodes = pending.next()
+                results[index] = score
+                nodesSearched += nodes
+            except (SearchTimeout, StopIteration):
+                pass
+        stop_event.clear()
+    
+    # Earliest of the best scores, as in the sequential search
+    for index, move in enumerate(root_moves):
+        score = results.get(index)
+        if score is not None and ((score > best_score) if player_is_white else (score < best_score)):
+            best_move, best_score = move, score
+    if stopped:
+        if thinking_queue:
+            _putSearchEnd(gs, thinking_queue, best_move, best_score, DEPTH)
+        nextMove = best_move
+        return best_move
+    reportIteration(DEPTH, best_move, best_score)
+    
+    if thinking_queue:
+        thinking_queue.put(_rootMovesEvent(gs, DEPTH, [(move, results[index])
+                                                       for index, move in enumerate(root_moves)]))
+        thinking_queue.put(_iterationEvent(gs, DEPTH, best_move, best_score, start_time))
+        _putSearchEnd(gs, thinking_queue, best_move, best_score, DEPTH)
+    
+    nextMove = best_move
+    return best_move
+
+
+# ============================================================================
+# ============================== LAZY SMP ==================================
+# ============================================================================
+# Shared table of the running process, created on the first Lazy SMP search
+_sharedTable = None
+# Helpers of the running process, started by the first Lazy SMP search:
+# (workers, processes, job queue of each, done queue, stop event, node counter)
+_lazySmpHelpers = None
+# Nodes searched by all processes of the last Lazy SMP search
+lazySmpNodes = 0
+
+
+def _lazySmpHelper(tableName, helperIndex, jobs, done, stopEvent, nodeCounter):
+    """
+    Helper process of Lazy SMP. For every (snapshot, options, time limit) job:
+    iterative deepening on that position until stopEvent is set, only sharing
+    results through the transposition table, then helperIndex on done.
+    Nodes are added to nodeCounter on every clock check.
+    Odd helpers start one ply deeper and each rotates the root moves, so the
+    helpers spread over different parts of the tree. A None job ends it.
+    """
+    global transpositionTable, searchStopEvent, searchDeadline, searchNodeLimit, progressCallback, \
+        iterationCallback, helperNodeCounter
+    transpositionTable = SharedTranspositionTable(name=tableName)
+    searchStopEvent = stopEvent
+    # The main search checks the node limit on the nodes of all processes and
+    # stops the helpers through stopEvent
+    searchNodeLimit = None
+    helperNodeCounter = None
+    iterationCallback = None
+    published = [0]
+    
+    def publishNodes():
+        with nodeCounter.get_lock():
+            nodeCounter.value += nodesSearched - published[0]
+        published[0] = nodesSearched
+    
+    progressCallback = publishNodes
+    try:
+        for snapshot, options, timeLimit in iter(jobs.get, None):
+            searchDeadline = time.perf_counter() + timeLimit
+            searchOptions.update(options)
+            gs = GameState.from_snapshot(snapshot)
+            root_moves = _prepareSearch(gs, gs.getValidMoves())
+            published[0] = 0
+            if root_moves:
+                shift = helperIndex % len(root_moves)
+                root_moves = root_moves[shift:] + root_moves[:shift]
+            player_is_white = gs.whiteToMove
+            try:
+                for depth in range(1 + helperIndex % 2, MAX_DEPTH + 1):
+                    _, _, scores = searchRoot(gs, root_moves, depth)
+                    scores.sort(key=lambda item: item[1], reverse=player_is_white)
+                    root_moves = [move for move, _ in scores] + root_moves[len(scores):]
+            except SearchTimeout:
+                pass
+            finally:
+                publishNodes()
+                done.put(helperIndex)
+    finally:
+        transpositionTable.close()
+
+
+def _getLazySmpHelpers(workers):
+    """The helper processes of Lazy SMP, restarted if the worker count changes or one died"""
+    global _lazySmpHelpers
+    if _lazySmpHelpers is not None and (_lazySmpHelpers[0] != workers
+                                        or not all(helper.is_alive() for helper in _lazySmpHelpers[1])):
+        _stopLazySmpHelpers()
+    if _lazySmpHelpers is None:
+        jobs = [multiprocessing.Queue() for _ in range(1, workers)]
+        done = multiprocessing.Queue()
+        stop_event = multiprocessing.Event()
+        node_counter = multiprocessing.Value('q', 0)
+        helpers = [multiprocessing.Process(target=_lazySmpHelper, daemon=True,
+                                           args=(_sharedTable.name, index, jobs[index - 1], done,
+                                                 stop_event, node_counter))
+                   for index in range(1, workers)]
+        for helper in helpers:
+            helper.start()
+        _lazySmpHelpers = (workers, helpers, jobs, done, stop_event, node_counter)
+    return _lazySmpHelpers
+
+
+def _stopLazySmpHelpers():
+    """End the helper processes (they are idle between searches)"""
+    global _lazySmpHelpers
+    if _lazySmpHelpers is not None:
+        _, helpers, jobs, _, _, _ = _lazySmpHelpers
+        for job_queue in jobs:
+            job_queue.put(None)
+        for helper in helpers:
+            helper.join(timeout=5)
+            if helper.is_alive():
+                helper.terminate()
+        _lazySmpHelpers = None
+
+
+def findBestMoveLazySMP(gs, validMoves, thinking_queue=None, ai_info=None,
+                        timeLimit=MOVE_TIME_LIMIT, workers=PARALLEL_WORKERS, maxDepth=MAX_DEPTH, fullTime=False):
+    """
+    Lazy SMP: findBestMoveIterativeDeepening here plus workers - 1 helper
+    processes searching the same position, all through one shared-memory
+    transposition table. The move is the one of this process's search.
+    The helpers stay alive between searches.
+    """
+    global transpositionTable, _sharedTable, lazySmpNodes, helperNodeCounter
+    if _sharedTable is None:
+        _sharedTable = SharedTranspositionTable(TT_SIZE_MB)
+    _sharedTable.nextGeneration()
+    
+    if thinking_queue:
+        thinking_queue.put((EVENT_LAZY_SMP, {"workers": workers}))
+    _, _, jobs, done, stop_event, node_counter = _getLazySmpHelpers(workers)
+    node_counter.value = 0
+    snapshot = gs.snapshot()
+    options = dict(searchOptions)
+    for job_queue in jobs:
+        job_queue.put((snapshot, options, timeLimit))
+    
+    local_table, transpositionTable = transpositionTable, _sharedTable
+    helperNodeCounter = node_counter
+    try:
+        best_move = findBestMoveIterativeDeepening(gs, validMoves, thinking_queue, ai_info,
+                                                   timeLimit, maxDepth, fullTime)
+    finally:
+        transpositionTable = local_table
+        helperNodeCounter = None
+        stop_event.set()
+        for _ in jobs:
+            done.get()
+        stop_event.clear()
+    lazySmpNodes = nodesSearched + node_counter.value
+    return best_move
+
+
+def shutdownLazySMP():
+    """Stop the helpers and free the shared transposition table"""
+    global _sharedTable
+    _stopLazySmpHelpers()
+    if _sharedTable is not None:
+        _sharedTable.close(unlink=True)
+        _sharedTable = None
+
+
+def configureSearch(ai_algorithms):
+    """Switch optional search features on or off from an AI settings dict"""
+    for option in searchOptions:
+        searchOptions[option] = bool(ai_algorithms and ai_algorithms.get(option, False))
+
+
+def clearSearchTables():
+    """Forget everything learnt by earlier searches (new game)"""
+    transpositionTable.clear()
+    # Pool workers and Lazy SMP helpers keep tables of their own, new ones start empty
+    shutdownParallelPool()
+    _stopLazySmpHelpers()
+    if _sharedTable is not None:
+        _sharedTable.clear()
+    for table in historyTable:
+        table[:] = [0] * 4096
+    resetMoveOrdering()
+
+
+def searchBestMove(gs, ai_algorithms=None, thinking_queue=None, ai_info=None):
+    """Run the search selected by ai_algorithms and ai_info['mode'] on gs and return its move"""
     global nextMove
     nextMove = None
     
+    validMoves = gs.getValidMoves()
+    configureSearch(ai_algorithms)
+    
     # Use the algorithm specified by ai_info mode (user selection)
     use_alpha_beta = False  # Default to random
     
@@ -266,9 +1556,37 @@ def findBestMove(gs, validMoves, returnQueue, ai_algorithms=None, thinking_queue
             use_alpha_beta = False
     
     # Execute the selected algorithm
-    if use_alpha_beta:
+    if use_alpha_beta and ai_algorithms and ai_algorithms.get("lazy_smp", False):
+        nextMove = findBestMoveLazySMP(gs, validMoves, thinking_queue, ai_info,
+                                       ai_algorithms.get("time_limit", MOVE_TIME_LIMIT),
+                                       ai_algorithms.get("workers", PARALLEL_WORKERS),
+                                       ai_algorithms.get("max_depth", MAX_DEPTH))
+    elif use_alpha_beta and ai_algorithms and ai_algorithms.get("iterative_deepening", False):
+        nextMove = findBestMoveIterativeDeepening(gs, validMoves, thinking_queue, ai_info,
+                                                  ai_algorithms.get("time_limit", MOVE_TIME_LIMIT),
+                                                  ai_algorithms.get("max_depth", MAX_DEPTH))
+    elif use_alpha_beta and ai_algorithms and ai_algorithms.get("parallel_root", False):
+        nextMove = findBestMoveParallel(gs, validMoves, thinking_queue, ai_info,
+                                        ai_algorithms.get("workers", PARALLEL_WORKERS))
+    elif use_alpha_beta:
         nextMove = findBestMoveAlphaBeta(gs, validMoves, thinking_queue, ai_info)
     else:
         nextMove = findRandomMoves(validMoves, thinking_queue, ai_info)
-    
-    returnQueue.put(nextMove)
+    return nextMove
+
+
+def findBestMove(snapshot, returnQueue, ai_algorithms=None, thinking_queue=None, ai_info=None):
+    """One-shot process entry point: rebuild the position from GameState.snapshot() and search it"""
+    global progressCallback
+    gs = GameState.from_snapshot(snapshot)
+    if thinking_queue is not None:
+        thinking_queue = EventBatcher(thinking_queue)
+        progressCallback = thinking_queue.tick
+    try:
+        move = searchBestMove(gs, ai_algorithms, thinking_queue, ai_info)
+    finally:
+        progressCallback = None
+        if thinking_queue is not None:
+            thinking_queue.flush()
+    shutdownLazySMP()
+    returnQueue.put(move)
@@ -1,14 +1,71 @@
 import chess
 import chess.pgn
+import chess.polyglot
+
+# Zobrist keys use the Polyglot random numbers so they match chess.polyglot.zobrist_hash
+_ZOBRIST_RANDOM = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+# _ZOBRIST_PIECES[(piece_type - 1) * 2 + color][square], color is 1 for white
+_ZOBRIST_PIECES = [_ZOBRIST_RANDOM[64 * index:64 * (index + 1)] for index in range(12)]
+_ZOBRIST_TURN = _ZOBRIST_RANDOM[780]
+_ZOBRIST_CASTLING = [(chess.BB_H1, _ZOBRIST_RANDOM[768]), (chess.BB_A1, _ZOBRIST_RANDOM[769]),
+                     (chess.BB_H8, _ZOBRIST_RANDOM[770]), (chess.BB_A8, _ZOBRIST_RANDOM[771])]
+
+
+def _castlingKey(castling_rights):
+    """Zobrist component of a castling rights bitmask"""
+    key = 0
+    for rook_square, value in _ZOBRIST_CASTLING:
+        if castling_rights & rook_square:
+            key ^= value
+    return key
+
+
+def _enPassantKey(board):
+    """Zobrist component of the en passant square (only if a pawn can capture, as in Polyglot)"""
+    ep_square = board.ep_square
+    if ep_square is None:
+        return 0
+    if board.turn == chess.WHITE:
+        ep_mask = chess.shift_down(chess.BB_SQUARES[ep_square])
+    else:
+        ep_mask = chess.shift_up(chess.BB_SQUARES[ep_square])
+    ep_mask = chess.shift_left(ep_mask) | chess.shift_right(ep_mask)
+    if ep_mask & board.pawns & board.occupied_co[board.turn]:
+        return _ZOBRIST_RANDOM[772 + (ep_square & 7)]
+    return 0
+
+
+# Results of GameState.outcome(), None while the game is still going
+OUTCOME_CHECKMATE = "checkmate"
+OUTCOME_STALEMATE = "stalemate"
+OUTCOME_DRAW = "draw"  # insufficient material, 75-move rule or fivefold repetition
+
+# Upper bound on memoized position outcomes kept per GameState
+OUTCOME_CACHE_SIZE = 200000
+
 
 class GameState():
-    def __init__(self):
+    def __init__(self, fen=None):
         # Use python-chess board
-        self.board = chess.Board()
+        self.board = chess.Board(fen) if fen else chess.Board()
         
         # Keep track of move history for our GUI
         self.moveLog = []
         
+        # Cached 8x8 piece array, updated by delta on make/undo
+        self._syncBoardArray()
+        
+        # 64-bit Zobrist key of the position, updated by delta on make/undo
+        self._syncZobristKey()
+        
+        # Position-only outcomes (mate, stalemate, insufficient material) by Zobrist key
+        self._outcomeCache = {}
+        
+        # Incremental evaluation, off until trackEvaluation() is called by the AI
+        self.evalTables = None
+        self.evalSums = None
+        self._evalHistory = []
+        
         # GUI-specific settings
         self.playerWantsToPlayAsBlack = False
         
@@ -20,19 +77,18 @@ class GameState():
         self.whiteToMove = self.board.turn  # True for white, False for black
         
     def makeMove(self, move):
-        """Make a move on the board"""
+        """Make a move on the board (accepts our Move or a raw chess.Move)"""
         # Convert our custom move to python-chess move
         chess_move = self._convert_to_chess_move(move)
         
         if chess_move in self.board.legal_moves:
             # Store the move in our log
+            if move is chess_move:
+                move = Move.fromChessMove(chess_move, self.board.copy(stack=False))
             self.moveLog.append(move)
             
             # Make the move on python-chess board
-            self.board.push(chess_move)
-            
-            # Update turn
-            self.whiteToMove = self.board.turn
+            self.push_trusted(chess_move)
             
             # Update game state flags
             self._update_game_state()
@@ -45,34 +101,84 @@ class GameState():
             
             # Undo on python-chess board
             if len(self.board.move_stack) > 0:
-                self.board.pop()
-                
-            # Update turn
-            self.whiteToMove = self.board.turn
+                self.pop_trusted()
             
             # Reset game state flags
             self.checkmate = False
             self.stalemate = False
     
+    def push_trusted(self, chess_move):
+        """
+        Search fast path: push a chess.Move known to be legal in this position.
+        Skips the legality check, the moveLog and the checkmate/stalemate flags.
+        """
+        self._updateBoardArray(chess_move)
+        self._pushIncremental(chess_move)
+        self.whiteToMove = self.board.turn
+    
+    def push_null(self):
+        """
+        Search fast path: pass the turn (null move), undone by pop_trusted.
+        Only meaningful when the side to move is not in check.
+        """
+        board = self.board
+        key = self.zobristKey ^ _ZOBRIST_TURN ^ _enPassantKey(board)
+        self._boardArrayUndo.append([])
+        board.push(chess.Move.null())
+        self._keyHistory.append(self.zobristKey)
+        self.zobristKey = key
+        if self.evalTables is not None:
+            self._evalHistory.append(self.evalSums)
+        self.whiteToMove = board.turn
+    
+    def pop_trusted(self):
+        """Undo the last push_trusted (or makeMove) on the board only"""
+        self.board.pop()
+        self._restoreBoardArray()
+        self.zobristKey = self._keyHistory.pop()
+        if self.evalTables is not None:
+            self.evalSums = self._evalHistory.pop()
+        self.whiteToMove = self.board.turn
+    
     def getValidMoves(self):
         """Get all valid moves for current player"""
-        moves = []
-        
-        # Get legal moves from python-chess
-        legal_moves = list(self.board.legal_moves)
-        
-        # Convert to our move format
-        for chess_move in legal_moves:
-            move = self._convert_from_chess_move(chess_move)
-            moves.append(move)
-            
-        return moves
+        # One snapshot of the position is shared by every move in the list,
+        # piece details are only looked up when the GUI reads them
+        snapshot = self.board.copy(stack=False)
+        return [Move.fromChessMove(chess_move, snapshot) for chess_move in snapshot.legal_moves]
+    
+    def snapshot(self):
+        """
+        Compact, picklable description of the position for the AI worker:
+        (FEN at the last irreversible move, space separated UCI moves since).
+        Its size is bounded by the halfmove clock, not by the game length.
+        """
+        plies = min(self.board.halfmove_clock, len(self.board.move_stack))
+        recent = self.board.copy(stack=plies)
+        return (recent.root().fen(), " ".join(move.uci() for move in recent.move_stack))
+    
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Create a GameState from snapshot(), replaying the recent moves for repetition tracking"""
+        fen, moves = snapshot
+        gs = cls(fen)
+        for uci in moves.split():
+            gs.makeMove(chess.Move.from_uci(uci))
+        return gs
     
     def copy(self):
         """Create a deep copy of the game state for simulations"""
         new_gs = GameState()
         new_gs.board = self.board.copy()
         new_gs.moveLog = self.moveLog.copy()
+        new_gs._syncBoardArray()
+        new_gs._boardArrayUndo = self._boardArrayUndo.copy()
+        new_gs.zobristKey = self.zobristKey
+        new_gs._keyHistory = self._keyHistory.copy()
+        new_gs._outcomeCache = self._outcomeCache
+        new_gs.evalTables = self.evalTables
+        new_gs.evalSums = self.evalSums
+        new_gs._evalHistory = self._evalHistory.copy()
         new_gs.playerWantsToPlayAsBlack = self.playerWantsToPlayAsBlack
         new_gs.checkmate = self.checkmate
         new_gs.stalemate = self.stalemate
@@ -80,90 +186,218 @@ class GameState():
         return new_gs
     
     def get_board_array(self):
-        """Convert python-chess board to 2D array for GUI compatibility"""
-        board_array = []
-        
-        # Create 8x8 array
+        """
+        Return the cached 8x8 board array for GUI compatibility.
+        This is a read-only view that is kept up to date by makeMove/undoMove,
+        it is not copied so callers must not hold on to it across moves
+        expecting the old position.
+        """
+        return self._boardArray
+    
+    def _syncBoardArray(self):
+        """Rebuild the cached board array from the python-chess board"""
+        rows = []
         for rank in range(8):
             row = []
             for file in range(8):
                 square = chess.square(file, 7-rank)  # Convert coordinates
-                piece = self.board.piece_at(square)
-                
-                if piece is None:
-                    row.append("--")
-                else:
-                    # Convert to our piece notation (e.g., 'wK', 'bp')
-                    color = 'w' if piece.color == chess.WHITE else 'b'
-                    piece_type = piece.symbol().upper()
-                    if piece_type == 'P':
-                        piece_type = 'p'
-                    row.append(color + piece_type)
-            board_array.append(row)
-            
-        return board_array
+                # Convert to our piece notation (e.g., 'wK', 'bp')
+                row.append(_pieceCode(self.board.piece_at(square)))
+            rows.append(_ReadOnlyList(row))
+        self._boardArray = _ReadOnlyList(rows)
+        self._boardArrayUndo = []
+    
+    def _updateBoardArray(self, chess_move):
+        """Apply a move (not yet pushed) to the cached board array"""
+        rows = self._boardArray
+        start_row = 7 - chess.square_rank(chess_move.from_square)
+        start_col = chess.square_file(chess_move.from_square)
+        end_row = 7 - chess.square_rank(chess_move.to_square)
+        end_col = chess.square_file(chess_move.to_square)
+        piece = rows[start_row][start_col]
+        
+        # (row, col, previous piece) for every square touched by the move
+        changes = [(start_row, start_col, piece), (end_row, end_col, rows[end_row][end_col])]
+        placed = piece
+        if piece[1] == 'K' and abs(end_col - start_col) == 2:
+            # Castling: move the rook next to the king as well
+            rook_col, rook_end_col = (7, 5) if end_col > start_col else (0, 3)
+            rook = rows[start_row][rook_col]
+            changes.append((start_row, rook_col, rook))
+            changes.append((start_row, rook_end_col, rows[start_row][rook_end_col]))
+            list.__setitem__(rows[start_row], rook_col, '--')
+            list.__setitem__(rows[start_row], rook_end_col, rook)
+        elif piece[1] == 'p':
+            if start_col != end_col and rows[end_row][end_col] == '--':
+                # En passant: captured pawn is on starting row
+                changes.append((start_row, end_col, rows[start_row][end_col]))
+                list.__setitem__(rows[start_row], end_col, '--')
+            if chess_move.promotion:
+                placed = piece[0] + chess.piece_symbol(chess_move.promotion).upper()
+        
+        list.__setitem__(rows[start_row], start_col, '--')
+        list.__setitem__(rows[end_row], end_col, placed)
+        self._boardArrayUndo.append(changes)
+    
+    def _restoreBoardArray(self):
+        """Revert the cached board array to before the last applied move"""
+        rows = self._boardArray
+        for row, col, previous in reversed(self._boardArrayUndo.pop()):
+            list.__setitem__(rows[row], col, previous)
+    
+    def _syncZobristKey(self):
+        """Compute the Zobrist key from scratch and forget the key history"""
+        self.zobristKey = chess.polyglot.zobrist_hash(self.board)
+        self._keyHistory = []
+    
+    def _pushIncremental(self, chess_move):
+        """Push chess_move on the board, updating the Zobrist key and evaluation sums by delta"""
+        board = self.board
+        color = board.turn
+        from_square = chess_move.from_square
+        to_square = chess_move.to_square
+        piece_type = board.piece_type_at(from_square)
+        placed_type = chess_move.promotion or piece_type
+        
+        key = self.zobristKey ^ _ZOBRIST_TURN ^ _castlingKey(board.castling_rights) ^ _enPassantKey(board)
+        key ^= _ZOBRIST_PIECES[piece_type * 2 - 2 + color][from_square]
+        key ^= _ZOBRIST_PIECES[placed_type * 2 - 2 + color][to_square]
+        
+        # Piece-square delta for the side to move and the value it takes from the opponent
+        tables = self.evalTables
+        if tables is not None:
+            own_tables = tables[color]
+            own_delta = own_tables[placed_type][to_square] - own_tables[piece_type][from_square]
+            captured_value = 0
+        
+        captured_type = board.piece_type_at(to_square)
+        if captured_type:
+            key ^= _ZOBRIST_PIECES[captured_type * 2 - 2 + (not color)][to_square]
+            if tables is not None:
+                captured_value = tables[not color][captured_type][to_square]
+        elif piece_type == chess.PAWN and (from_square ^ to_square) & 7:
+            # En passant: captured pawn is behind the destination square
+            captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+            key ^= _ZOBRIST_PIECES[chess.PAWN * 2 - 2 + (not color)][captured_square]
+            if tables is not None:
+                captured_value = tables[not color][chess.PAWN][captured_square]
+        elif piece_type == chess.KING and abs(to_square - from_square) == 2:
+            # Castling: the rook jumps over the king
+            if to_square > from_square:
+                rook_from, rook_to = to_square + 1, to_square - 1
+            else:
+                rook_from, rook_to = to_square - 2, to_square + 1
+            rook_keys = _ZOBRIST_PIECES[chess.ROOK * 2 - 2 + color]
+            key ^= rook_keys[rook_from] ^ rook_keys[rook_to]
+            if tables is not None:
+                own_delta += own_tables[chess.ROOK][rook_to] - own_tables[chess.ROOK][rook_from]
+        
+        board.push(chess_move)
+        self._keyHistory.append(self.zobristKey)
+        self.zobristKey = key ^ _castlingKey(board.castling_rights) ^ _enPassantKey(board)
+        
+        if tables is not None:
+            black_sum, white_sum = self.evalSums
+            self._evalHistory.append(self.evalSums)
+            if color == chess.WHITE:
+                self.evalSums = (black_sum - captured_value, white_sum + own_delta)
+            else:
+                self.evalSums = (black_sum + own_delta, white_sum - captured_value)
+    
+    def trackEvaluation(self, tables):
+        """
+        Keep per-side evaluation sums up to date on every push/pop.
+        tables[color][piece_type][square] is the value of a piece on a square
+        (python-chess indices), evalSums is then (black total, white total).
+        """
+        sums = [0, 0]
+        for square, piece in self.board.piece_map().items():
+            sums[piece.color] += tables[piece.color][piece.piece_type][square]
+        self.evalTables = tables
+        self.evalSums = (sums[chess.BLACK], sums[chess.WHITE])
+        self._evalHistory = []
+    
+    def repetitionCount(self):
+        """
+        Number of times the current position has occurred, found by walking the
+        key history back to the last capture or pawn move (halfmove clock)
+        """
+        key = self.zobristKey
+        history = self._keyHistory
+        count = 1
+        for index in range(2, min(self.board.halfmove_clock, len(history)) + 1, 2):
+            if history[-index] == key:
+                count += 1
+        return count
+    
+    def isThreefoldRepetition(self):
+        """Check if the current position has occurred at least three times"""
+        return self.repetitionCount() >= 3
+    
+    def isFivefoldRepetition(self):
+        """Check if the current position has occurred at least five times"""
+        return self.repetitionCount() >= 5
     
     def _convert_to_chess_move(self, custom_move):
         """Convert our custom move format to python-chess move"""
-        start_square = chess.square(custom_move.startCol, 7 - custom_move.startRow)
-        end_square = chess.square(custom_move.endCol, 7 - custom_move.endRow)
+        if isinstance(custom_move, chess.Move):
+            return custom_move
         
-        # Handle promotion
-        promotion = None
-        # Prefer an explicit promotion attribute if present (set by AI),
+        # Prefer an explicit promotion piece (set by the GUI popup or AI),
         # otherwise fall back to the isPawnPromotion flag (default to queen).
-        if hasattr(custom_move, 'promotion') and custom_move.promotion:
-            promo = custom_move.promotion
-            if isinstance(promo, str):
-                promo = promo.upper()
-                if promo == 'Q':
-                    promotion = chess.QUEEN
-                elif promo == 'R':
-                    promotion = chess.ROOK
-                elif promo == 'B':
-                    promotion = chess.BISHOP
-                elif promo == 'N':
-                    promotion = chess.KNIGHT
-        elif hasattr(custom_move, 'isPawnPromotion') and custom_move.isPawnPromotion:
+        promotion = None
+        if custom_move.promotion:
+            promotion = Move.promotionPieceTypes.get(custom_move.promotion.upper())
+        elif custom_move.isPawnPromotion:
             promotion = chess.QUEEN
-
+        
+        # Moves wrapped from python-chess can be reused as they are
+        chess_move = custom_move.chessMove
+        if chess_move is not None and chess_move.promotion == promotion:
+            return chess_move
+        
+        start_square = chess.square(custom_move.startCol, 7 - custom_move.startRow)
+        end_square = chess.square(custom_move.endCol, 7 - custom_move.endRow)
         return chess.Move(start_square, end_square, promotion)
     
     def _convert_from_chess_move(self, chess_move):
         """Convert python-chess move to our custom move format"""
-        start_row = 7 - chess.square_rank(chess_move.from_square)
-        start_col = chess.square_file(chess_move.from_square)
-        end_row = 7 - chess.square_rank(chess_move.to_square)
-        end_col = chess.square_file(chess_move.to_square)
-        
-        # Create move with current board state
-        board_array = self.get_board_array()
-        move = Move((start_row, start_col), (end_row, end_col), board_array)
-        
-        # Set special move flags
-        move.castle = self.board.is_castling(chess_move)
-        move.isEnpassantMove = self.board.is_en_passant(chess_move)
+        return Move.fromChessMove(chess_move, self.board.copy(stack=False))
+    
+    def outcome(self, legalMoves=None):
+        """
+        Return OUTCOME_CHECKMATE, OUTCOME_STALEMATE, OUTCOME_DRAW or None.
+        Pass the legal move list if it was already generated for this position,
+        mate and stalemate are then read from it instead of generating moves again.
+        """
+        key = self.zobristKey
+        result = self._outcomeCache.get(key, 0)
+        if result == 0:
+            if legalMoves is not None:
+                has_moves = len(legalMoves) > 0
+            else:
+                has_moves = any(self.board.generate_legal_moves())
+            if not has_moves:
+                result = OUTCOME_CHECKMATE if self.board.is_check() else OUTCOME_STALEMATE
+            elif self.board.is_insufficient_material():
+                result = OUTCOME_DRAW
+            else:
+                result = None
+            if len(self._outcomeCache) >= OUTCOME_CACHE_SIZE:
+                self._outcomeCache.clear()
+            self._outcomeCache[key] = result
         
-        # Check for pawn promotion
-        if chess_move.promotion:
-            move.isPawnPromotion = True
-            # Map python-chess promotion back to a simple symbol for GUI/AI
-            if chess_move.promotion == chess.QUEEN:
-                move.promotion = 'Q'
-            elif chess_move.promotion == chess.ROOK:
-                move.promotion = 'R'
-            elif chess_move.promotion == chess.BISHOP:
-                move.promotion = 'B'
-            elif chess_move.promotion == chess.KNIGHT:
-                move.promotion = 'N'
-            
-        return move
+        # History dependent draws are not cached
+        if result is None and (self.board.halfmove_clock >= 150 or self.isFivefoldRepetition()):
+            return OUTCOME_DRAW
+        return result
     
     def _update_game_state(self):
         """Update checkmate and stalemate flags"""
-        if self.board.is_checkmate():
+        result = self.outcome()
+        if result == OUTCOME_CHECKMATE:
             self.checkmate = True
-        elif self.board.is_stalemate() or self.board.is_insufficient_material() or self.board.is_seventyfive_moves() or self.board.is_fivefold_repetition():
+        elif result is not None:
             self.stalemate = True
     
     def getBoardString(self):
@@ -191,20 +425,57 @@ class GameState():
         return None
 
 
+class _ReadOnlyList(list):
+    """List that can be read at native speed but not modified through its public API"""
+    
+    def _readOnly(self, *args, **kwargs):
+        raise TypeError("board array is read-only, use GameState.makeMove/undoMove")
+    
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readOnly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readOnly
+    
+    def __reduce__(self):
+        # Unpickling would otherwise rebuild the list through append/extend
+        return (type(self), (list(self),))
+
+
+def _pieceCode(piece):
+    """Convert a python-chess piece to our notation (e.g. 'wK', 'bp', '--')"""
+    if piece is None:
+        return '--'
+    color = 'w' if piece.color == chess.WHITE else 'b'
+    piece_type = piece.symbol().upper()
+    if piece_type == 'P':
+        piece_type = 'p'
+    return color + piece_type
+
+
 class Move():
     """Move class for compatibility with existing GUI"""
     
+    # Fixed attribute set: no per-move __dict__, and promotion always exists
+    __slots__ = ('startRow', 'startCol', 'endRow', 'endCol', 'pieceMoved', 'pieceCaptured',
+                 'castle', 'isEnpassantMove', 'isCapture', 'moveID', 'isPawnPromotion',
+                 'promotion', 'chessMove', '_board')
+    
     # Chess notation mappings
     ranksToRows = {"1": 7, "2": 6, "3": 5, "4": 4, "5": 3, "6": 2, "7": 1, "8": 0}
     rowsToRanks = {value: key for key, value in ranksToRows.items()}
     filesToCols = {"a": 0, "b": 1, "c": 2, "d": 3, "e": 4, "f": 5, "g": 6, "h": 7}
     colsToFiles = {value: key for key, value in filesToCols.items()}
     
+    # Lookup tables: squareNames[row][col] -> 'e4', promotion piece type <-> symbol
+    squareNames = [[chess.square_name(chess.square(col, 7 - row)) for col in range(8)] for row in range(8)]
+    promotionSymbols = {None: None, chess.QUEEN: 'Q', chess.ROOK: 'R', chess.BISHOP: 'B', chess.KNIGHT: 'N'}
+    promotionPieceTypes = {'Q': chess.QUEEN, 'R': chess.ROOK, 'B': chess.BISHOP, 'N': chess.KNIGHT}
+    
     def __init__(self, startSquare, endSquare, board, isEnpassantMove=False, castle=False):
         self.startRow = startSquare[0]
         self.startCol = startSquare[1]
         self.endRow = endSquare[0]
         self.endCol = endSquare[1]
+        self.chessMove = None
+        self._board = None
         
         # Get piece information
         self.pieceMoved = board[self.startRow][self.startCol]
@@ -224,8 +495,9 @@ class Move():
         # Generate unique move ID
         self.moveID = self.startRow * 1000 + self.startCol * 100 + self.endRow * 10 + self.endCol
         
-        # Check for pawn promotion
+        # Check for pawn promotion, the piece is chosen later by the GUI or AI
         self.isPawnPromotion = self._check_pawn_promotion()
+        self.promotion = None
     
     def _check_pawn_promotion(self):
         """Check if this move is a pawn promotion"""
@@ -235,6 +507,61 @@ class Move():
                 return True
         return False
     
+    @classmethod
+    def fromChessMove(cls, chess_move, board):
+        """
+        Wrap a python-chess move without building the board array.
+        Squares and promotion are filled in right away, everything else is
+        resolved from `board` on first access, so `board` must not change afterwards.
+        """
+        move = cls.__new__(cls)
+        move.chessMove = chess_move
+        move.startRow = 7 - (chess_move.from_square >> 3)
+        move.startCol = chess_move.from_square & 7
+        move.endRow = 7 - (chess_move.to_square >> 3)
+        move.endCol = chess_move.to_square & 7
+        move.promotion = cls.promotionSymbols[chess_move.promotion]
+        move.isPawnPromotion = chess_move.promotion is not None
+        move._board = board
+        return move
+    
+    def __getattr__(self, name):
+        """Resolve the lazy attributes of a move created by fromChessMove"""
+        # Only called for unset slots; private names are never lazy
+        if name.startswith('_') or self._board is None:
+            raise AttributeError(name)
+        self._resolve()
+        return object.__getattribute__(self, name)
+    
+    def _resolve(self):
+        """Fill in piece and flag attributes from the position the move was generated in"""
+        chess_move = self.chessMove
+        board = self._board
+        self._board = None
+        
+        self.pieceMoved = _pieceCode(board.piece_at(chess_move.from_square))
+        self.isEnpassantMove = board.is_en_passant(chess_move)
+        if self.isEnpassantMove:
+            # For en passant, captured pawn is on starting row
+            captured_square = chess.square(self.endCol, 7 - self.startRow)
+        else:
+            captured_square = chess_move.to_square
+        self.pieceCaptured = _pieceCode(board.piece_at(captured_square))
+        self.isCapture = self.pieceCaptured != '--'
+        self.castle = board.is_castling(chess_move)
+        self.moveID = self.startRow * 1000 + self.startCol * 100 + self.endRow * 10 + self.endCol
+    
+    def __getstate__(self):
+        """Pickle slot values by position, without the position snapshot"""
+        if self._board is not None:
+            self._resolve()
+        return tuple(getattr(self, name) for name in self.__slots__[:-1])
+    
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+        self._board = None
+    
     def __eq__(self, other):
         """Check if two moves are equal"""
         if isinstance(other, Move):
@@ -243,7 +570,13 @@ class Move():
     
     def getRankFile(self, row, col):
         """Convert row, col to chess notation"""
-        return self.colsToFiles[col] + self.rowsToRanks[row]
+        return self.squareNames[row][col]
+    
+    def uci(self):
+        """The move in UCI notation, e.g. 'e7e8q' (unchosen promotions count as queen)"""
+        promotion = self.promotion or ('Q' if self.isPawnPromotion else '')
+        return (self.squareNames[self.startRow][self.startCol] + self.squareNames[self.endRow][self.endCol]
+                + promotion.lower())
     
     def __str__(self):
         """String representation of the move"""
@@ -0,0 +1,231 @@
+"""
+Long-lived engine process for the GUI. Instead of a new Process per AI move,
+one worker keeps python-chess loaded and its search tables warm between moves
+and answers requests sent through EngineWorker:
+
+    newPosition(snapshot)           set the position (GameState.snapshot())
+    go(ai_algorithms, ai_info, hardLimit)
+                                    search it, the move is read back with poll()
+    bestSoFar()                     best move of the deepest completed iteration
+    ponder(snapshot, ponderMove, ai_algorithms, ai_info, hardLimit)
+                                    search the position after the expected reply
+                                    while the opponent thinks
+    ponderHit()                     the expected reply was played: finish that search
+    stop()                          end the running search as soon as possible
+    clear()                         forget the search tables (new game)
+    close()                         shut the worker down
+
+Stopping is cooperative: the search notices within TIME_CHECK_INTERVAL nodes
+and still answers, with the move of its deepest completed iteration (for a
+fixed-depth search, the best of the root moves it searched to the end).
+
+A ponder search has no time limit. After ponderHit() it gets the time of a
+normal search counted from when pondering started, so a long enough think
+of the opponent makes the answer immediate. On a miss stop() it and search
+the real position: the transposition table is still warm from pondering.
+
+Search progress arrives on the thinking queue as lists of chessAi events
+((kind, fields) tuples), at most one list every chessAi.PROGRESS_INTERVAL.
+"""
+import atexit
+import queue
+import time
+from multiprocessing import Event, Process, Queue, Value
+
+import chessAi
+from engine import GameState
+
+# Requests sent to the worker: (REQUEST_POSITION, snapshot),
+# (REQUEST_GO, search id, ai_algorithms, ai_info), (REQUEST_CLEAR,), (REQUEST_QUIT,)
+REQUEST_POSITION = "position"
+REQUEST_GO = "go"
+REQUEST_CLEAR = "clear"
+REQUEST_QUIT = "quit"
+
+# Replies: (search id, REPLY_ITERATION, (depth, move, score)) for every completed
+# iteration, then (search id, REPLY_BESTMOVE, (move, ponder move)) once the search
+# is over; the ponder move is the expected reply as UCI, or None
+REPLY_ITERATION = "iteration"
+REPLY_BESTMOVE = "bestmove"
+
+
+class _StopRequest():
+    """searchStopEvent of one search: set once stop() was called for its id or a later one"""
+    
+    def __init__(self, stoppedId, searchId):
+        self.stoppedId = stoppedId
+        self.searchId = searchId
+    
+    def is_set(self):
+        return self.stoppedId.value >= self.searchId
+
+
+def runEngineWorker(requests, results, thinking, stoppedId, ready):
+    """Worker process loop: answer requests until REQUEST_QUIT"""
+    gs = GameState()
+    ready.set()
+    while True:
+        request = requests.get()
+        kind = request[0]
+        if kind == REQUEST_POSITION:
+            gs = GameState.from_snapshot(request[1])
+        elif kind == REQUEST_GO:
+            _, search_id, ai_algorithms, ai_info = request
+            completed = [None]  # Move of the deepest completed iteration
+            
+            def reportIteration(depth, move, score):
+                completed[0] = move
+                results.put((search_id, REPLY_ITERATION, (depth, move, score)))
+            
+            events = chessAi.EventBatcher(thinking)
+            chessAi.searchStopEvent = _StopRequest(stoppedId, search_id)
+            chessAi.iterationCallback = reportIteration
+            chessAi.progressCallback = events.tick
+            stack_size = len(gs.board.move_stack)
+            try:
+                move = chessAi.searchBestMove(gs, ai_algorithms, events, ai_info)
+            except chessAi.SearchTimeout:
+                # Stopped inside an iteration: unwind it and answer with the last completed one
+                while len(gs.board.move_stack) > stack_size:
+                    gs.pop_trusted()
+                move = completed[0]
+            finally:
+                chessAi.searchStopEvent = None
+                chessAi.iterationCallback = None
+                chessAi.progressCallback = None
+                events.flush()
+            ponder_move = None
+            if move is not None:
+                pv = chessAi.principalVariation(gs, move, 2)
+                ponder_move = pv[1] if len(pv) > 1 else None
+            results.put((search_id, REPLY_BESTMOVE, (move, ponder_move)))
+        elif kind == REQUEST_CLEAR:
+            chessAi.clearSearchTables()
+        elif kind == REQUEST_QUIT:
+            break
+    chessAi.shutdownParallelPool()
+    chessAi.shutdownLazySMP()
+
+
+class EngineWorker():
+    """GUI side of the engine process; every call returns immediately"""
+    
+    def __init__(self):
+        self.requests = Queue()
+        self.results = Queue()
+        self.thinking = Queue()  # Lists of search progress events
+        self.stoppedId = Value('q', 0)
+        self.searchId = 0
+        self.deadline = None  # perf_counter() time at which poll() stops the search
+        self.iteration = (0, None, None)  # (depth, move, score) of the current search
+        self.answer = None  # (move,) once the current search has answered
+        self.ponderMove = None  # Expected reply to the last answered move (UCI), None if unknown
+        self.pondering = None  # Reply the running ponder search assumes (UCI), None if not pondering
+        self.ponderStart = None
+        self.ponderLimit = None
+        self.ready = Event()
+        # Not a daemon: the parallel searches start processes of their own
+        self.process = Process(target=runEngineWorker,
+                               args=(self.requests, self.results, self.thinking, self.stoppedId, self.ready))
+        self.process.start()
+        atexit.register(self.close)
+    
+    def newPosition(self, snapshot):
+        self.requests.put((REQUEST_POSITION, snapshot))
+    
+    def go(self, ai_algorithms=None, ai_info=None, hardLimit=None):
+        """
+        Start searching the current position, returns the id of the search.
+        With hardLimit (seconds), poll() stops the search once it has run that
+        long and the best move it has found so far is played.
+        """
+        self.searchId += 1
+        self.deadline = time.perf_counter() + hardLimit if hardLimit is not None else None
+        self.iteration = (0, None, None)
+        self.answer = None
+        self.pondering = None
+        self.requests.put((REQUEST_GO, self.searchId, ai_algorithms, ai_info))
+        return self.searchId
+    
+    def ponder(self, snapshot, ponderMove, ai_algorithms=None, ai_info=None, hardLimit=None):
+        """
+        Search the position of snapshot after ponderMove (UCI) without a time
+        limit, until ponderHit() or stop(). The other arguments are those of
+        the go() that would follow the move.
+        """
+        fen, moves = snapshot
+        self.newPosition((fen, f"{moves} {ponderMove}".lstrip()))
+        ai_algorithms = ai_algorithms or {}
+        if ai_algorithms.get("iterative_deepening", False) or ai_algorithms.get("lazy_smp", False):
+            self.ponderLimit = ai_algorithms.get("time_limit", chessAi.MOVE_TIME_LIMIT)
+        else:
+            self.ponderLimit = hardLimit  # Fixed depth: only the hard limit applies
+        search_id = self.go(dict(ai_algorithms, time_limit=float('inf')), ai_info)
+        self.pondering = ponderMove
+        self.ponderStart = time.perf_counter()
+        return search_id
+    
+    def ponderHit(self):
+        """
+        The opponent played the expected move: the ponder search becomes the
+        search of this move, stopped by poll() once its time since ponder() is up.
+        """
+        self.pondering = None
+        if self.ponderLimit is not None:
+            self.deadline = self.ponderStart + self.ponderLimit
+    
+    def stop(self):
+        """
+        Ask the running (and any queued) search to stop. It still answers
+        through poll(), with the move of its deepest completed iteration.
+        Also ends pondering.
+        """
+        self.stoppedId.value = self.searchId
+        self.pondering = None
+    
+    def bestSoFar(self):
+        """(depth, move, score) of the deepest iteration the current search completed, (0, None, None) before"""
+        self._readReplies()
+        return self.iteration
+    
+    def clear(self):
+        self.requests.put((REQUEST_CLEAR,))
+    
+    def poll(self):
+        """
+        (True, move) once the last search has answered, else (False, None).
+        A stopped search still answers with a move, None only without legal moves.
+        """
+        self._readReplies()
+        if self.answer is not None:
+            return True, self.answer[0]
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            self.deadline = None
+            self.stop()
+        return False, None
+    
+    def _readReplies(self):
+        """Consume the replies received so far for the current search"""
+        while self.answer is None:
+            try:
+                search_id, kind, payload = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if search_id != self.searchId:
+                continue  # Reply of a search that was stopped and replaced
+            if kind == REPLY_ITERATION:
+                self.iteration = payload
+            else:
+                move, self.ponderMove = payload
+                self.answer = (move,)
+                self.deadline = None
+    
+    def close(self):
+        """Stop any search and end the worker process"""
+        if not self.process.is_alive():
+            return
+        self.stop()
+        self.requests.put((REQUEST_QUIT,))
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
@@ -6,12 +6,15 @@ os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
 warnings.filterwarnings('ignore', message=r'pkg_resources is deprecated as an API.*', category=UserWarning, module=r'pygame\.pkgdata')
 warnings.filterwarnings('ignore', message=r'.*pkg_resources.*deprecated.*', category=UserWarning)
 
+import queue
 import sys
+import chess
 import pygame as p
 
 from engine import GameState, Move
-from chessAi import findRandomMoves, findBestMove
-from multiprocessing import Process, Queue
+import chessAi
+from chessAi import findRandomMoves
+from engineWorker import EngineWorker
 
 # Safe sound playing function
 def play_sound(sound):
@@ -45,7 +48,14 @@ AI_ALGORITHMS = {
     "alpha_beta": True,
     "iterative_deepening": False,
     "killer_heuristic": False,
-    "mvv_lva": False
+    "mvv_lva": False,
+    "quiescence": False,
+    "pvs": False,
+    "null_move": False,
+    "lmr": False,
+    "parallel_root": False,
+    "lazy_smp": False,
+    "ponder": False
 }
 
 AI1_ALGORITHMS = {
@@ -53,7 +63,13 @@ AI1_ALGORITHMS = {
     "alpha_beta": True,
     "iterative_deepening": False,
     "killer_heuristic": False,
-    "mvv_lva": False
+    "mvv_lva": False,
+    "quiescence": False,
+    "pvs": False,
+    "null_move": False,
+    "lmr": False,
+    "parallel_root": False,
+    "lazy_smp": False
 }
 
 AI2_ALGORITHMS = {
@@ -61,7 +77,13 @@ AI2_ALGORITHMS = {
     "alpha_beta": False,
     "iterative_deepening": False,
     "killer_heuristic": False,
-    "mvv_lva": False
+    "mvv_lva": False,
+    "quiescence": False,
+    "pvs": False,
+    "null_move": False,
+    "lmr": False,
+    "parallel_root": False,
+    "lazy_smp": False
 }
 
 SCREEN_WIDTH = 1800
@@ -89,6 +111,7 @@ MAX_FPS = 15
 IMAGES = {}
 
 ai_thinking_log = []
+ai_thinking_live = False  # True while the last log line is the progress of the running search
 ai_thinking_scroll_offset = 0
 ai_thinking_dragging = False
 ai_thinking_last_mouse_y = 0
@@ -120,6 +143,8 @@ THEMES = {
 
 game_mode = None
 current_screen = "landing"  # "landing" or "game"
+engine_worker = None  # EngineWorker searching the AI moves, started by the first game
+MAX_AI_MOVE_TIME = 30  # seconds; then the AI plays the best move its search has found so far
 
 def get_theme_colors():
     """Get current theme colors - always returns classic theme"""
@@ -182,11 +207,21 @@ def draw_ai_settings_screen(screen):
     checkbox_font = p.font.SysFont("Segoe UI", 16)
     checkbox_size = 20
     start_y = 170
-    spacing = 50
+    spacing = 45
     
     algorithms = [
         ("random", "Random Move Generator"),
-        ("alpha_beta", "Alpha-Beta Pruning")
+        ("alpha_beta", "Alpha-Beta Pruning"),
+        ("iterative_deepening", "Iterative Deepening (time limited)"),
+        ("killer_heuristic", "Killer Moves + History Heuristic"),
+        ("mvv_lva", "MVV-LVA Capture Ordering"),
+        ("quiescence", "Quiescence Search"),
+        ("pvs", "Principal Variation Search + Aspiration Windows"),
+        ("null_move", "Null-Move Pruning"),
+        ("lmr", "Late Move Reductions"),
+        ("parallel_root", "Parallel Root Search (fixed depth)"),
+        ("lazy_smp", "Lazy SMP (time limited, shared table)"),
+        ("ponder", "Ponder (think on your time)")
     ]
     
     checkbox_rects = []
@@ -278,7 +313,16 @@ def draw_ai_vs_ai_settings_screen(screen):
     # Algorithm options
     algorithms = [
         ("random", "Random Move Generator"),
-        ("alpha_beta", "Alpha-Beta Pruning")
+        ("alpha_beta", "Alpha-Beta Pruning"),
+        ("iterative_deepening", "Iterative Deepening (time limited)"),
+        ("killer_heuristic", "Killer Moves + History Heuristic"),
+        ("mvv_lva", "MVV-LVA Capture Ordering"),
+        ("quiescence", "Quiescence Search"),
+        ("pvs", "Principal Variation Search + Aspiration Windows"),
+        ("null_move", "Null-Move Pruning"),
+        ("lmr", "Late Move Reductions"),
+        ("parallel_root", "Parallel Root Search (fixed depth)"),
+        ("lazy_smp", "Lazy SMP (time limited, shared table)")
     ]
     
     # AI 1 Section
@@ -657,9 +701,19 @@ def main():
         p.display.flip()
         clock.tick(MAX_FPS)
     
+    if engine_worker is not None:
+        engine_worker.close()
     p.quit()
     sys.exit()
 
+def get_engine_worker():
+    """The engine process shared by every game, started on first use"""
+    global engine_worker
+    if engine_worker is None:
+        engine_worker = EngineWorker()
+    return engine_worker
+
+
 def run_chess_game(screen, clock):
     global current_screen, game_mode
     
@@ -694,12 +748,12 @@ def run_chess_game(screen, clock):
     playerClicks = []
     gameOver = False  # gameover if checkmate or stalemate
     AIThinking = False  # True if ai is thinking
-    moveFinderProcess = None
+    engineWorker = get_engine_worker()
+    engineWorker.stop()
+    engineWorker.clear()  # New game: nothing learnt in the previous one applies
+    thinkingQueue = engineWorker.thinking
     moveUndone = False
     pieceCaptured = False
-    positionHistory = ""
-    previousPos = ""
-    countMovesForDraw = 0
     COUNT_DRAW = 0
     promotion_in_progress = False  # Flag to prevent double promotion popups
     
@@ -749,7 +803,7 @@ def run_chess_game(screen, clock):
                                         # Apply the promotion choice to the move
                                         chosen_move.promotion = promotion_choice
                                         promotion_in_progress = False
-                                    elif chosen_move.isPawnPromotion and not hasattr(chosen_move, 'promotion'):
+                                    elif chosen_move.isPawnPromotion and chosen_move.promotion is None:
                                         # If it's an AI move or promotion wasn't set, default to Queen
                                         chosen_move.promotion = 'Q'
                                     
@@ -781,8 +835,8 @@ def run_chess_game(screen, clock):
                     moveMade = True
                     animate = False
                     gameOver = False
-                    if AIThinking:
-                        moveFinderProcess.terminate()
+                    if AIThinking or engineWorker.pondering:
+                        engineWorker.stop()
                         AIThinking = False
                     moveUndone = True
                 elif e.key == p.K_r:  # reset board when 'r' is pressed
@@ -793,11 +847,13 @@ def run_chess_game(screen, clock):
                     moveMade = False
                     animate = False
                     gameOver = False
-                    if AIThinking:
-                        moveFinderProcess.terminate()
+                    if AIThinking or engineWorker.pondering:
+                        engineWorker.stop()
                         AIThinking = False
+                    engineWorker.clear()
                     moveUndone = True
                 elif e.key == p.K_ESCAPE:  # Return to landing page
+                    engineWorker.stop()
                     current_screen = "landing"
                     return True
             
@@ -849,8 +905,6 @@ def run_chess_game(screen, clock):
         if not gameOver and not humanTurn and not moveUndone:
             if not AIThinking:
                 AIThinking = True
-                returnQueue = Queue()
-                thinkingQueue = Queue()  # New queue for thinking process
                 
                 # Determine which AI algorithms to use and prepare AI info
                 if game_mode == AI_VS_AI:
@@ -900,19 +954,17 @@ def run_chess_game(screen, clock):
                     'mode': ai_mode
                 }
                 
-                moveFinderProcess = Process(target=findBestMove, args=(
-                    gs, validMoves, returnQueue, current_ai_algorithms, thinkingQueue, ai_info))
-                moveFinderProcess.start()
-            if not moveFinderProcess.is_alive():
-                # Collect thinking messages from queue
-                while not thinkingQueue.empty():
-                    try:
-                        thinking_msg = thinkingQueue.get_nowait()
-                        ai_thinking_log.append(thinking_msg)
-                    except:
-                        break
-                
-                AIMove = returnQueue.get()
+                if engineWorker.pondering and gs.board.move_stack[-1].uci() == engineWorker.pondering:
+                    # The human played the expected move: the ponder search answers
+                    engineWorker.ponderHit()
+                else:
+                    if engineWorker.pondering:
+                        engineWorker.stop()  # Wrong guess, its table entries still help
+                    # Only a compact snapshot of the position is sent to the worker
+                    engineWorker.newPosition(gs.snapshot())
+                    engineWorker.go(current_ai_algorithms, ai_info, MAX_AI_MOVE_TIME)
+            searchDone, AIMove = engineWorker.poll()
+            if searchDone:
                 if AIMove is None:
                     # Create AI info for fallback call
                     if game_mode == AI_VS_AI:
@@ -930,6 +982,13 @@ def run_chess_game(screen, clock):
                     pieceCaptured = True
 
                 gs.makeMove(AIMove)
+                
+                # Search the human's expected reply while they think
+                if game_mode == HUMAN_VS_AI and AI_ALGORITHMS.get("ponder", False) \
+                        and ai_info['mode'] == "Alpha-Beta" and engineWorker.ponderMove \
+                        and chess.Move.from_uci(engineWorker.ponderMove) in gs.board.legal_moves:
+                    engineWorker.ponder(gs.snapshot(), engineWorker.ponderMove, AI_ALGORITHMS,
+                                        dict(ai_info, ponder=engineWorker.ponderMove), MAX_AI_MOVE_TIME)
 
                 if AIMove.isPawnPromotion:
                     # AI promotion - don't show popup, the promotion piece is already chosen by AI
@@ -949,19 +1008,8 @@ def run_chess_game(screen, clock):
                 playerClicks = []
 
         if moveMade:
-            if countMovesForDraw == 0 or countMovesForDraw == 1 or countMovesForDraw == 2 or countMovesForDraw == 3:
-                countMovesForDraw += 1
-            if countMovesForDraw == 4:
-                positionHistory += gs.getBoardString()
-                if previousPos == positionHistory:
-                    COUNT_DRAW += 1
-                    positionHistory = ""
-                    countMovesForDraw = 0
-                else:
-                    previousPos = positionHistory
-                    positionHistory = ""
-                    countMovesForDraw = 0
-                    COUNT_DRAW = 0
+            # Threefold repetition, answered from the Zobrist key history
+            COUNT_DRAW = 1 if gs.isThreefoldRepetition() else 0
             # Call animateMove to animate the move
             if animate:
                 animateMove(gs.moveLog[-1], screen, gs.get_board_array(), clock)
@@ -971,6 +1019,8 @@ def run_chess_game(screen, clock):
             animate = False
             moveUndone = False
 
+        # Search progress received since the last frame
+        drainThinkingEvents(thinkingQueue)
         drawGameState(screen, gs, validMoves, squareSelected, moveLogFont)
 
         if COUNT_DRAW == 1:
@@ -1326,6 +1376,73 @@ def drawMoveLog(screen, gs, font, content_rect):
         p.draw.rect(screen, (220, 220, 240), indicator_rect, 1)
 
 
+def drainThinkingEvents(thinkingQueue):
+    """Add the search events waiting in thinkingQueue to ai_thinking_log, without blocking"""
+    while True:
+        try:
+            events = thinkingQueue.get_nowait()
+        except queue.Empty:
+            return
+        # The engine worker sends lists of events, the random fallback single events
+        if isinstance(events, tuple):
+            events = [events]
+        for event in events:
+            addThinkingEvent(event)
+
+
+def addThinkingEvent(event):
+    """Format one chessAi search event for the AI Thinking panel"""
+    global ai_thinking_live
+    kind, fields = event
+    if ai_thinking_live:
+        # Live progress is replaced by the next report of the search
+        ai_thinking_log.pop()
+        ai_thinking_live = False
+    separator = "-" * 60
+    
+    if kind == chessAi.EVENT_START:
+        player = f"AI {fields['color']}" if fields['color'] else "AI"
+        ai_thinking_log.append(separator)
+        if fields['ponder']:
+            ai_thinking_log.append(f"{player} [{fields['algorithm']}] is pondering on {fields['ponder']}...")
+        else:
+            ai_thinking_log.append(f"{player} [{fields['algorithm']}] is analyzing...")
+        if 'depth' in fields:
+            ai_thinking_log.append(f"Analyzing {fields['moves']} possible moves at depth {fields['depth']}")
+        elif fields['ponder']:
+            ai_thinking_log.append(f"Analyzing {fields['moves']} possible moves until the opponent moves")
+        elif 'time_limit' in fields:
+            ai_thinking_log.append(f"Analyzing {fields['moves']} possible moves for up to {fields['time_limit']:.1f}s")
+        else:
+            ai_thinking_log.append(f"Choosing from {fields['moves']} possible moves")
+    elif kind == chessAi.EVENT_LAZY_SMP:
+        ai_thinking_log.append(f"Lazy SMP with {fields['workers']} processes")
+    elif kind == chessAi.EVENT_RESEARCH:
+        ai_thinking_log.append(f"Depth {fields['depth']}: score {fields['score']} outside "
+                               f"({fields['alpha']:.2f}, {fields['beta']:.2f}), re-searching")
+    elif kind == chessAi.EVENT_ROOT_MOVES:
+        for move, score in fields['scores']:
+            ai_thinking_log.append(f"Move {move}: Score = {score}")
+    elif kind == chessAi.EVENT_ITERATION:
+        ai_thinking_log.append(f"Depth {fields['depth']}: best {fields['move']} (Score: {fields['score']}) "
+                               f"{fields['nodes']} nodes, {fields['nps']:.0f} nps, {fields['elapsed']:.2f}s")
+        ai_thinking_log.append("PV: " + " ".join(fields['pv']))
+    elif kind == chessAi.EVENT_PROGRESS:
+        ai_thinking_log.append(f"Searching... {fields['nodes']} nodes, {fields['nps']:.0f} nps, "
+                               f"{fields['elapsed']:.1f}s")
+        ai_thinking_live = True
+    elif kind == chessAi.EVENT_TABLE:
+        ai_thinking_log.append(f"Transposition table: {fields['hits']} hits, {fields['misses']} misses, "
+                               f"{fields['collisions']} collisions, {fields['filled']:.0%} full")
+    elif kind == chessAi.EVENT_BEST_MOVE:
+        if fields['score'] is None:
+            ai_thinking_log.append(f"Selected move -> {fields['move']}")
+        else:
+            ai_thinking_log.append(f"Best move selected: {fields['move']} "
+                                   f"(Score: {fields['score']}, depth {fields['depth']})")
+        ai_thinking_log.append(separator)
+
+
 def drawAIThinking(screen, font, content_rect):
     """Draw the AI thinking process in the content area with scrolling support"""
     global ai_thinking_log, ai_thinking_scroll_offset
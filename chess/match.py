@@ -0,0 +1,364 @@
+"""
+Headless AI-vs-AI matches: games are played concurrently over a process
+pool, streamed to a PGN file and summarised with the Elo difference, its
+95% error bars and an optional SPRT that stops the match once decided.
+Run from the chess folder, for example:
+
+    python match.py --engine1 full --engine2 alpha_beta,pvs --games 200 --movetime 0.2
+    python match.py --engine1 alpha_beta --engine2 random --depth 2 --sprt 0 50
+
+Engines are comma separated AI settings, as the checkboxes of the GUI
+(alpha_beta, killer_heuristic, pvs, ...), "full" for every search option
+or "random", plus optional per-engine limits depth=N, movetime=S, nodes=N.
+With movetime or nodes the engine iterates deeper until that limit, and
+depth then caps the iterations instead of fixing the depth.
+Each opening is played twice with colors swapped.
+"""
+import argparse
+import math
+import multiprocessing
+import random
+import sys
+import time
+
+import chess
+import chess.pgn
+
+import chessAi
+from engine import GameState, OUTCOME_CHECKMATE, OUTCOME_STALEMATE
+
+# Engine settings keys besides the search options; the parallel searches
+# cannot start processes of their own inside a pool worker
+MATCH_ALGORITHMS = ("random", "alpha_beta", "iterative_deepening")
+MATCH_LIMITS = {"depth": int, "movetime": float, "nodes": int}
+
+# Adjudication defaults: draw once every search score stayed within
+# DRAW_SCORE pawns for DRAW_PLIES plies after move DRAW_MOVE, loss once a
+# side's own search saw itself RESIGN_SCORE pawns down on RESIGN_MOVES moves
+# in a row, draw after MAX_PLIES plies
+DRAW_MOVE = 40
+DRAW_PLIES = 8
+DRAW_SCORE = 0.1
+RESIGN_SCORE = 10
+RESIGN_MOVES = 3
+MAX_PLIES = 400
+
+# SPRT error rates
+SPRT_ALPHA = 0.05
+SPRT_BETA = 0.05
+
+
+# ============================================================================
+# ============================ ENGINE SETTINGS =============================
+# ============================================================================
+def parseEngine(spec):
+    """AI settings dict of an engine spec such as "alpha_beta,pvs,depth=3" """
+    settings = {}
+    for token in spec.split(","):
+        token = token.strip()
+        name, _, value = token.partition("=")
+        if token == "full":
+            settings["alpha_beta"] = True
+            settings.update(dict.fromkeys(chessAi.searchOptions, True))
+        elif name in MATCH_LIMITS and value:
+            settings[name] = MATCH_LIMITS[name](value)
+        elif token in MATCH_ALGORITHMS or token in chessAi.searchOptions:
+            settings[token] = True
+        else:
+            raise ValueError(f"unknown engine setting {token!r}")
+    if not settings.get("random") and not settings.get("alpha_beta"):
+        settings["alpha_beta"] = True  # Search options alone mean alpha-beta
+    return settings
+
+
+def engineName(spec, settings):
+    return "Random" if settings.get("random") and not settings.get("alpha_beta") else spec
+
+
+# ============================================================================
+# ============================= GAME PLAYING ===============================
+# ============================================================================
+# Pool worker: search tables of each engine, so engines in one process do not share them
+_engineTables = {}
+_defaultDepth = chessAi.DEPTH
+
+
+def _useEngineTables(engine):
+    """Switch chessAi to the transposition table and history of engine (0 or 1)"""
+    if engine not in _engineTables:
+        _engineTables[engine] = (chessAi.TranspositionTable(), [[0] * 4096, [0] * 4096], [None] * 4096)
+    chessAi.transpositionTable, chessAi.historyTable, chessAi.counterMoves = _engineTables[engine]
+
+
+def searchMove(gs, settings):
+    """Move of one engine in gs and the score of its deepest completed iteration (None if unknown)"""
+    ai_algorithms = dict(settings)
+    ai_info = {"color": "White" if gs.whiteToMove else "Black",
+               "mode": "Alpha-Beta" if settings.get("alpha_beta") else "Random"}
+    if "movetime" in settings:
+        ai_algorithms.update(iterative_deepening=True, time_limit=settings["movetime"])
+    elif "nodes" in settings:
+        ai_algorithms.update(iterative_deepening=True, time_limit=math.inf)
+    if ai_algorithms.get("iterative_deepening") and "depth" in settings:
+        ai_algorithms["max_depth"] = settings["depth"]
+    chessAi.DEPTH = settings.get("depth", _defaultDepth)
+    chessAi.searchNodeLimit = settings.get("nodes")
+    
+    completed = [None]
+    chessAi.iterationCallback = lambda depth, move, score: completed.__setitem__(0, score)
+    try:
+        move = chessAi.searchBestMove(gs, ai_algorithms, None, ai_info)
+    finally:
+        chessAi.searchNodeLimit = None
+        chessAi.iterationCallback = None
+    return move, completed[0]
+
+
+def randomOpening(plies, seed):
+    """UCI moves of a random opening, replayed until it does not end the game"""
+    rng = random.Random(seed)
+    while True:
+        board = chess.Board()
+        for _ in range(plies):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        if not board.is_game_over():
+            return [move.uci() for move in board.move_stack]
+
+
+def playGame(task):
+    """
+    Pool worker: play one game. Returns (game index, result, termination,
+    PGN text). engines are (name, settings) of white and black.
+    """
+    index, fen, opening, engines, engine_ids, adjudication, seed = task
+    random.seed(seed)
+    gs = GameState(fen)
+    for uci in opening:
+        gs.makeMove(chess.Move.from_uci(uci))
+    for engine in engine_ids:
+        _useEngineTables(engine)
+        chessAi.clearSearchTables()
+    
+    result, termination = None, None
+    draw_plies = 0
+    losing_moves = [0, 0]
+    while result is None:
+        outcome = gs.outcome()
+        if outcome == OUTCOME_CHECKMATE:
+            result, termination = ("0-1" if gs.whiteToMove else "1-0"), "checkmate"
+            break
+        if outcome == OUTCOME_STALEMATE:
+            result, termination = "1/2-1/2", "stalemate"
+            break
+        if outcome is not None or gs.isThreefoldRepetition() or gs.board.halfmove_clock >= 100:
+            result, termination = "1/2-1/2", "draw"
+            break
+        if len(gs.board.move_stack) >= adjudication["max_plies"]:
+            result, termination = "1/2-1/2", "adjudication: move limit"
+            break
+        
+        side = 0 if gs.whiteToMove else 1
+        _useEngineTables(engine_ids[side])
+        move, score = searchMove(gs, engines[side][1])
+        gs.makeMove(move)
+        
+        # Adjudication on the search scores (white's point of view)
+        if score is not None and abs(score) <= adjudication["draw_score"] \
+                and gs.board.fullmove_number > adjudication["draw_move"]:
+            draw_plies += 1
+        else:
+            draw_plies = 0
+        own_score = None if score is None else (score if side == 0 else -score)
+        losing_moves[side] = losing_moves[side] + 1 if own_score is not None \
+            and own_score <= -adjudication["resign_score"] else 0
+        if draw_plies >= adjudication["draw_plies"]:
+            result, termination = "1/2-1/2", "adjudication: draw"
+        elif losing_moves[side] >= adjudication["resign_moves"]:
+            result, termination = ("0-1" if side == 0 else "1-0"), "adjudication: resign"
+    
+    game = chess.pgn.Game.from_board(gs.board)
+    game.headers["Event"] = "chessAi match"
+    game.headers["Site"] = "match.py"
+    game.headers["Date"] = time.strftime("%Y.%m.%d")
+    game.headers["Round"] = str(index + 1)
+    game.headers["White"] = engines[0][0]
+    game.headers["Black"] = engines[1][0]
+    game.headers["Result"] = result
+    game.headers["Termination"] = termination
+    return index, result, termination, str(game)
+
+
+# ============================================================================
+# ============================== STATISTICS ================================
+# ============================================================================
+def expectedScore(elo):
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def eloDifference(score):
+    """Elo difference of an expected score (clamped away from 0 and 1)"""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def _regularized(wins, draws, losses):
+    """Results with half a game added to each kind if one is missing, so the variance is not zero"""
+    if wins and draws and losses:
+        return wins, draws, losses
+    return wins + 0.5, draws + 0.5, losses + 0.5
+
+
+def eloEstimate(wins, draws, losses):
+    """(Elo difference, half width of its 95% confidence interval) from engine1's results"""
+    if not wins + draws + losses:
+        return 0.0, math.inf
+    wins, draws, losses = _regularized(wins, draws, losses)
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(variance / games)
+    return eloDifference(score), (eloDifference(score + margin) - eloDifference(score - margin)) / 2
+
+
+def sprtLLR(wins, draws, losses, elo0, elo1):
+    """Log-likelihood ratio of H1 (elo1) against H0 (elo0), trinomial normal approximation"""
+    if not wins + draws + losses:
+        return 0.0
+    wins, draws, losses = _regularized(wins, draws, losses)
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games
+    variance = (wins + draws / 4) / games - score ** 2
+    if variance <= 0:
+        return 0.0
+    score0, score1 = expectedScore(elo0), expectedScore(elo1)
+    return (score1 - score0) * (2 * score - score0 - score1) / (2 * variance / games)
+
+
+def sprtBounds(alpha=SPRT_ALPHA, beta=SPRT_BETA):
+    """(lower, upper) LLR bounds: accept H0 below lower, H1 above upper"""
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+# ============================================================================
+# ================================= MATCH ==================================
+# ============================================================================
+def matchTasks(args, engines):
+    """Game tasks in playing order: every opening twice, engine1 white first"""
+    openings = []
+    if args.openings:
+        with open(args.openings) as handle:
+            openings = [(line.strip(), []) for line in handle if line.strip()]
+    adjudication = {"draw_move": args.draw_move, "draw_plies": args.draw_plies, "draw_score": args.draw_score,
+                    "resign_score": args.resign_score, "resign_moves": args.resign_moves,
+                    "max_plies": args.max_plies}
+    for index in range(args.games):
+        pair = index // 2
+        if openings:
+            fen, opening = openings[pair % len(openings)]
+        else:
+            fen, opening = None, randomOpening(args.opening_plies, args.seed * 100003 + pair)
+        # Engine 0 is engine1: white in the first game of a pair
+        order = (0, 1) if index % 2 == 0 else (1, 0)
+        yield (index, fen, opening, (engines[order[0]], engines[order[1]]), order, adjudication,
+               args.seed * 100003 + index)
+
+
+def runMatch(args):
+    engines = [(engineName(spec, settings), settings)
+               for spec, settings in ((args.engine1, parseEngine(args.engine1)),
+                                      (args.engine2, parseEngine(args.engine2)))]
+    for _, settings in engines:
+        if args.depth is not None:
+            settings.setdefault("depth", args.depth)
+        if args.movetime is not None:
+            settings.setdefault("movetime", args.movetime)
+        if args.nodes is not None:
+            settings.setdefault("nodes", args.nodes)
+    if engines[0][0] == engines[1][0]:
+        engines = [(name + f" ({number})", settings) for number, (name, settings) in enumerate(engines, 1)]
+    print(f"{engines[0][0]} vs {engines[1][0]}: {args.games} games on {args.concurrency} processes")
+    
+    wins = draws = losses = 0
+    terminations = {}
+    llr_bounds = sprtBounds()
+    decision = None
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(args.concurrency)
+    try:
+        with open(args.pgn, "a") as pgn:
+            for index, result, termination, text in pool.imap_unordered(playGame, matchTasks(args, engines)):
+                pgn.write(text + "\n\n")
+                pgn.flush()
+                # Results from engine1's point of view, white in even games
+                if result == "1/2-1/2":
+                    draws += 1
+                elif (result == "1-0") == (index % 2 == 0):
+                    wins += 1
+                else:
+                    losses += 1
+                terminations[termination] = terminations.get(termination, 0) + 1
+                
+                games = wins + draws + losses
+                elo, margin = eloEstimate(wins, draws, losses)
+                line = f"Game {games:>4}: +{wins} ={draws} -{losses}  Elo {elo:+.1f} +/- {margin:.1f}"
+                if args.sprt:
+                    llr = sprtLLR(wins, draws, losses, *args.sprt)
+                    line += f"  LLR {llr:+.2f} ({llr_bounds[0]:.2f}, {llr_bounds[1]:.2f})"
+                    if llr >= llr_bounds[1]:
+                        decision = "H1 accepted"
+                    elif llr <= llr_bounds[0]:
+                        decision = "H0 accepted"
+                print(line, flush=True)
+                if decision:
+                    break
+    finally:
+        pool.terminate()
+        pool.join()
+    
+    games = wins + draws + losses
+    elo, margin = eloEstimate(wins, draws, losses)
+    print(f"Finished {games} games in {time.perf_counter() - start:.1f}s: "
+          f"{engines[0][0]} +{wins} ={draws} -{losses} against {engines[1][0]}")
+    print(f"Elo difference: {elo:+.1f} +/- {margin:.1f} (95%)")
+    if args.sprt:
+        print(f"SPRT elo0={args.sprt[0]:g} elo1={args.sprt[1]:g}: {decision or 'no decision'}")
+    print("Terminations: " + ", ".join(f"{name} {count}" for name, count in sorted(terminations.items())))
+    return wins, draws, losses, decision
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Play a headless match between two AI settings")
+    parser.add_argument("--engine1", default="full", help="settings of the engine under test")
+    parser.add_argument("--engine2", default="alpha_beta", help="settings of the reference engine")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=chessAi.PARALLEL_WORKERS,
+                        help="games played at once")
+    parser.add_argument("--depth", type=int, help="fixed search depth, or the deepest iteration with --movetime/--nodes")
+    parser.add_argument("--movetime", type=float, help="seconds per move (iterative deepening)")
+    parser.add_argument("--nodes", type=int, help="nodes per move (iterative deepening)")
+    parser.add_argument("--openings", help="file with one start FEN per line, else random openings")
+    parser.add_argument("--opening-plies", type=int, default=4, help="plies of a random opening")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--pgn", default="match.pgn", help="games are appended to this file")
+    parser.add_argument("--sprt", type=float, nargs=2, metavar=("ELO0", "ELO1"),
+                        help="stop once the SPRT of elo0 against elo1 decides")
+    parser.add_argument("--draw-move", type=int, default=DRAW_MOVE)
+    parser.add_argument("--draw-plies", type=int, default=DRAW_PLIES)
+    parser.add_argument("--draw-score", type=float, default=DRAW_SCORE)
+    parser.add_argument("--resign-score", type=float, default=RESIGN_SCORE)
+    parser.add_argument("--resign-moves", type=int, default=RESIGN_MOVES)
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES)
+    args = parser.parse_args(argv)
+    try:
+        parseEngine(args.engine1)
+        parseEngine(args.engine2)
+    except ValueError as error:
+        parser.error(str(error))
+    runMatch(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,172 @@
+"""
+Perft: count the leaf nodes of the move generation tree to a fixed depth,
+to verify GameState move generation against known counts and to time it.
+Run from the chess folder:
+
+    python perft.py                       # standard positions up to depth 3
+    python perft.py --depth 4 --workers 4 # deeper, root moves over 4 processes
+    python perft.py --fen "<fen>" --depth 3 --divide
+
+By default the tree is walked the GUI's way, getValidMoves/makeMove/undoMove;
+--trusted walks it the search's way, python-chess moves with
+push_trusted/pop_trusted. The last ply is counted in bulk from the move list.
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+
+import chess
+
+from engine import GameState
+
+# Standard perft positions (chessprogramming.org) with their node counts by depth
+PERFT_POSITIONS = [
+    ("start", chess.STARTING_FEN,
+     {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609}),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     {1: 48, 2: 2039, 3: 97862, 4: 4085603}),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624}),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     {1: 6, 2: 264, 3: 9467, 4: 422333}),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     {1: 44, 2: 1486, 3: 62379, 4: 2103487}),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     {1: 46, 2: 2079, 3: 89890, 4: 3894594}),
+]
+
+
+def _perftMoves(gs, depth):
+    """GUI path: getValidMoves, makeMove and undoMove"""
+    moves = gs.getValidMoves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        gs.makeMove(move)
+        nodes += _perftMoves(gs, depth - 1)
+        gs.undoMove()
+    return nodes
+
+
+def _perftTrusted(gs, depth):
+    """Search path: python-chess legal moves, push_trusted and pop_trusted"""
+    if depth == 1:
+        return gs.board.legal_moves.count()
+    nodes = 0
+    for move in list(gs.board.legal_moves):
+        gs.push_trusted(move)
+        nodes += _perftTrusted(gs, depth - 1)
+        gs.pop_trusted()
+    return nodes
+
+
+def _rootMoves(gs, trusted):
+    """(UCI, move) of every root move, in the move type of the walk"""
+    if trusted:
+        return [(move.uci(), move) for move in gs.board.legal_moves]
+    return [(move.uci(), move) for move in gs.getValidMoves()]
+
+
+def _divideTask(task):
+    """Pool worker: nodes below one root move"""
+    snapshot, uci, depth, trusted = task
+    gs = GameState.from_snapshot(snapshot)
+    move = chess.Move.from_uci(uci)
+    if trusted:
+        gs.push_trusted(move)
+        return uci, _perftTrusted(gs, depth - 1) if depth > 1 else 1
+    gs.makeMove(move)
+    return uci, _perftMoves(gs, depth - 1) if depth > 1 else 1
+
+
+def divide(gs, depth, trusted=False, workers=1):
+    """
+    [(root move as UCI, nodes below it), ...] of a perft to depth >= 1.
+    With workers > 1 the root moves are counted in a process pool.
+    """
+    root_moves = _rootMoves(gs, trusted)
+    if workers > 1:
+        snapshot = gs.snapshot()
+        with multiprocessing.Pool(workers) as pool:
+            return pool.map(_divideTask, [(snapshot, uci, depth, trusted) for uci, _ in root_moves],
+                            chunksize=1)
+    walk = _perftTrusted if trusted else _perftMoves
+    results = []
+    for uci, move in root_moves:
+        if depth == 1:
+            results.append((uci, 1))
+            continue
+        if trusted:
+            gs.push_trusted(move)
+            results.append((uci, walk(gs, depth - 1)))
+            gs.pop_trusted()
+        else:
+            gs.makeMove(move)
+            results.append((uci, walk(gs, depth - 1)))
+            gs.undoMove()
+    return results
+
+
+def perft(gs, depth, trusted=False, workers=1):
+    """Leaf nodes of the move generation tree of gs to depth (1 at depth 0)"""
+    if depth == 0:
+        return 1
+    if workers > 1:
+        return sum(nodes for _, nodes in divide(gs, depth, trusted, workers))
+    return (_perftTrusted if trusted else _perftMoves)(gs, depth)
+
+
+def runSuite(maxDepth, trusted=False, workers=1):
+    """Perft of PERFT_POSITIONS to maxDepth against the expected counts, True if all match"""
+    path = "push_trusted/pop_trusted" if trusted else "getValidMoves/makeMove/undoMove"
+    print(f"Perft up to depth {maxDepth} ({path}, {workers} process{'es' if workers > 1 else ''})")
+    passed = True
+    total_nodes = 0
+    total_time = 0.0
+    for name, fen, expected in PERFT_POSITIONS:
+        for depth in sorted(expected):
+            if depth > maxDepth:
+                break
+            start = time.perf_counter()
+            nodes = perft(GameState(fen), depth, trusted, workers)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+            status = "ok" if nodes == expected[depth] else f"FAIL, expected {expected[depth]}"
+            passed = passed and nodes == expected[depth]
+            print(f"  {name:<10} depth {depth}  nodes={nodes:>9}  time={elapsed:7.3f}s  "
+                  f"nps={nodes / elapsed if elapsed > 0 else 0:>9.0f}  {status}")
+    print(f"  total      nodes={total_nodes}  time={total_time:.3f}s  "
+          f"nps={total_nodes / total_time if total_time > 0 else 0:.0f}")
+    return passed
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Count and time GameState move generation")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fen", help="perft of this position instead of the standard set")
+    parser.add_argument("--divide", action="store_true", help="nodes below every root move")
+    parser.add_argument("--workers", type=int, default=1, help="processes counting the root moves")
+    parser.add_argument("--trusted", action="store_true", help="walk with push_trusted/pop_trusted")
+    args = parser.parse_args(argv)
+    
+    if args.fen is None:
+        return 0 if runSuite(args.depth, args.trusted, args.workers) else 1
+    gs = GameState(args.fen)
+    start = time.perf_counter()
+    if args.divide:
+        results = divide(gs, args.depth, args.trusted, args.workers)
+        for uci, nodes in sorted(results):
+            print(f"{uci}: {nodes}")
+        nodes = sum(nodes for _, nodes in results)
+    else:
+        nodes = perft(gs, args.depth, args.trusted, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Nodes: {nodes}  time={elapsed:.3f}s  nps={nodes / elapsed if elapsed > 0 else 0:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
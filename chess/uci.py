@@ -0,0 +1,232 @@
+"""
+UCI front end of the chessAi search, for tournament managers and benchmark
+harnesses without a display. Run from the chess folder:
+
+    python uci.py
+
+and talk UCI on stdin/stdout. Supported commands: uci, isready, ucinewgame,
+position [startpos | fen <fen>] [moves <uci>...],
+go [depth N] [movetime MS] [nodes N] [wtime MS] [btime MS] [winc MS] [binc MS]
+[movestogo N] [infinite], stop, setoption name Hash|Threads value N, quit.
+A malformed command, or a position with an illegal move, is ignored with
+an "info string" line.
+
+Every search is iterative deepening with all search options on; Threads
+above 1 switches to Lazy SMP. Mate scores count the moves of the principal
+variation, as the search itself does not track the distance to mate.
+"""
+import math
+import sys
+import threading
+import time
+
+import chess
+
+import chessAi
+from engine import GameState
+
+ENGINE_NAME = "chessAi"
+ENGINE_AUTHOR = "chessAi contributors"
+
+# Clock management: moves the remaining time is spread over when the GUI does
+# not send movestogo, and milliseconds kept back for the GUI and process overhead
+UCI_MOVES_TO_GO = 30
+UCI_MOVE_OVERHEAD = 50
+# Seconds between two "info nodes" reports while an iteration runs
+UCI_INFO_INTERVAL = 1.0
+
+# go arguments followed by a number
+_GO_LIMITS = ("depth", "movetime", "nodes", "wtime", "btime", "winc", "binc", "movestogo")
+
+
+def parseGo(tokens):
+    """Limits of a go command as a dict: the numeric ones by name, infinite as True"""
+    limits = {}
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        if token in _GO_LIMITS and index + 1 < len(tokens):
+            limits[token] = int(tokens[index + 1])
+            index += 1
+        elif token == "infinite":
+            limits["infinite"] = True
+        index += 1
+    return limits
+
+
+def searchTime(limits, whiteToMove):
+    """Seconds the search of a move may take under the go limits, inf for no time limit"""
+    if "movetime" in limits:
+        return max(1, limits["movetime"] - UCI_MOVE_OVERHEAD) / 1000
+    time_left = limits.get("wtime" if whiteToMove else "btime")
+    if time_left is None or limits.get("infinite"):
+        return math.inf
+    increment = limits.get("winc" if whiteToMove else "binc", 0)
+    budget = time_left / limits.get("movestogo", UCI_MOVES_TO_GO) + increment * 3 / 4
+    return max(1, min(budget, time_left - UCI_MOVE_OVERHEAD)) / 1000
+
+
+def uciScore(score, whiteToMove, pv):
+    """A search score (pawns, white's view) as a UCI score from the side to move's view"""
+    if abs(score) >= chessAi.CHECKMATE:
+        moves = (len(pv) + 1) // 2
+        return f"mate {moves if (score > 0) == whiteToMove else -moves}"
+    return f"cp {round(score * 100) * (1 if whiteToMove else -1)}"
+
+
+class UciEngine():
+    """UCI state: the position, options and the search thread"""
+    
+    def __init__(self, output=sys.stdout):
+        self.output = output
+        self.outputLock = threading.Lock()
+        self.gs = GameState()
+        self.threads = 1
+        self.searchThread = None
+        self.stopEvent = threading.Event()
+        self.lastInfo = 0.0
+    
+    def send(self, line):
+        with self.outputLock:
+            self.output.write(line + "\n")
+            self.output.flush()
+    
+    def handle(self, line):
+        """Answer one command line, returns False on quit"""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command = tokens[0]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {chessAi.TT_SIZE_MB} min 1 max 4096")
+            self.send("option name Threads type spin default 1 min 1 max 64")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "ucinewgame":
+            self.stop()
+            chessAi.clearSearchTables()
+        elif command == "setoption":
+            self.stop()
+            self.setOption(tokens[1:])
+        elif command == "position":
+            self.stop()
+            self.setPosition(tokens[1:])
+        elif command == "go":
+            self.stop()
+            self.go(parseGo(tokens[1:]))
+        elif command == "stop":
+            self.stop()
+        elif command == "quit":
+            self.stop()
+            chessAi.shutdownLazySMP()
+            return False
+        return True
+    
+    def setOption(self, tokens):
+        """setoption name <name> value <value>"""
+        if "name" not in tokens or "value" not in tokens:
+            return
+        name = " ".join(tokens[tokens.index("name") + 1:tokens.index("value")]).lower()
+        value = " ".join(tokens[tokens.index("value") + 1:])
+        if name == "hash":
+            chessAi.TT_SIZE_MB = max(1, int(value))
+            chessAi.transpositionTable.resize(chessAi.TT_SIZE_MB)
+            chessAi.shutdownLazySMP()  # The shared table is recreated at the new size
+        elif name == "threads":
+            self.threads = max(1, int(value))
+    
+    def setPosition(self, tokens):
+        """position [startpos | fen <fen>] [moves <uci>...]"""
+        moves = tokens.index("moves") if "moves" in tokens else len(tokens)
+        if tokens and tokens[0] == "fen":
+            gs = GameState(" ".join(tokens[1:moves]))
+        else:
+            gs = GameState()
+        for uci in tokens[moves + 1:]:
+            gs.makeMove(gs.board.parse_uci(uci))  # ValueError on an illegal move
+        self.gs = gs  # Only a valid position replaces the current one
+    
+    def go(self, limits):
+        self.stopEvent.clear()
+        self.searchThread = threading.Thread(target=self.search, args=(self.gs, limits), daemon=True)
+        self.searchThread.start()
+    
+    def stop(self):
+        """End the running search, which still sends its bestmove"""
+        if self.searchThread is not None:
+            self.stopEvent.set()
+            self.searchThread.join()
+            self.searchThread = None
+    
+    def search(self, gs, limits):
+        """Search thread: info lines for every iteration, then bestmove"""
+        self.whiteToMove = gs.whiteToMove
+        self.startTime = time.perf_counter()
+        chessAi.configureSearch(dict.fromkeys(chessAi.searchOptions, True))
+        chessAi.searchStopEvent = self.stopEvent
+        chessAi.searchNodeLimit = limits.get("nodes")
+        chessAi.progressCallback = self.tick
+        time_limit = searchTime(limits, gs.whiteToMove)
+        full_time = "movetime" in limits  # Only clock time is saved for later moves
+        max_depth = limits.get("depth", chessAi.MAX_DEPTH)
+        valid_moves = gs.getValidMoves()
+        move = None
+        try:
+            if valid_moves and self.threads > 1:
+                move = chessAi.findBestMoveLazySMP(gs, valid_moves, self, None, time_limit,
+                                                   self.threads, max_depth, full_time)
+            elif valid_moves:
+                move = chessAi.findBestMoveIterativeDeepening(gs, valid_moves, self, None,
+                                                              time_limit, max_depth, full_time)
+        finally:
+            chessAi.searchStopEvent = None
+            chessAi.searchNodeLimit = None
+            chessAi.progressCallback = None
+        
+        # An infinite search only answers once it is stopped
+        if limits.get("infinite"):
+            self.stopEvent.wait()
+        if move is None:
+            self.send("bestmove 0000")
+            return
+        pv = chessAi.principalVariation(gs, move, 2)
+        self.send(f"bestmove {pv[0]} ponder {pv[1]}" if len(pv) > 1 else f"bestmove {pv[0]}")
+    
+    def put(self, event):
+        """thinking_queue of the search: iterations become info lines, the other events are not reported"""
+        kind, fields = event
+        if kind == chessAi.EVENT_ITERATION:
+            self.lastInfo = time.perf_counter()
+            self.send(f"info depth {fields['depth']} score {uciScore(fields['score'], self.whiteToMove, fields['pv'])} "
+                      f"nodes {fields['nodes']} nps {round(fields['nps'])} time {round(fields['elapsed'] * 1000)} "
+                      f"pv {' '.join(fields['pv'])}")
+    
+    def tick(self):
+        """progressCallback: node count while a long iteration runs"""
+        now = time.perf_counter()
+        if now - self.lastInfo >= UCI_INFO_INTERVAL:
+            self.lastInfo = now
+            fields = chessAi.progressFields(self.startTime)
+            self.send(f"info nodes {fields['nodes']} nps {round(fields['nps'])} time {round(fields['elapsed'] * 1000)}")
+
+
+def main():
+    engine = UciEngine()
+    # A file object of our own: the processes forked by Lazy SMP close sys.stdin
+    # on start, which would wait forever for the lock held by this blocking read
+    commands = open(sys.stdin.fileno(), closefd=False)
+    for line in commands:
+        try:
+            if not engine.handle(line):
+                break
+        except (ValueError, IndexError) as error:
+            # A malformed command is ignored, the engine keeps running
+            engine.send(f"info string ignored {line.strip()!r}: {error}")
+    engine.stop()
+
+
+if __name__ == "__main__":
+    main()